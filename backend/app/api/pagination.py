@@ -0,0 +1,86 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+
+from app.core.config import settings
+
+
+@dataclass
+class PageParams:
+    cursor: str | None
+    limit: int
+
+
+def get_page_params(
+    cursor: str | None = None,
+    limit: int = Query(default=settings.PAGE_SIZE_DEFAULT, ge=1),
+) -> PageParams:
+    # clamp instead of rejecting, so "give me as many as you allow" just works
+    return PageParams(cursor=cursor, limit=min(limit, settings.PAGE_SIZE_MAX))
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _coerce(key, value):
+    python_type = key.type.python_type
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if not isinstance(value, python_type):
+        raise ValueError(f"bad cursor value for {key.key}")
+    return value
+
+
+def decode_cursor(cursor: str, keys) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the sort keys")
+        return [_coerce(key, value) for key, value in zip(keys, values)]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query, page: PageParams, *keys, descending: bool = False):
+    """
+    Seeks past the cursor on the given (unique, indexed) keys instead of using
+    OFFSET, so every page costs the same. Works on both Query and Select.
+    """
+    if page.cursor:
+        values = decode_cursor(page.cursor, keys)
+        left = keys[0] if len(keys) == 1 else tuple_(*keys)
+        right = values[0] if len(keys) == 1 else tuple(values)
+        query = query.filter(left < right if descending else left > right)
+        if len(keys) > 1:
+            # implied by the row comparison, but only a plain bound on the
+            # leading key reaches range/BRIN indexes and partition pruning
+            query = query.filter(keys[0] <= values[0] if descending else keys[0] >= values[0])
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    # one extra row tells us whether there is a next page
+    return query.order_by(*order).limit(page.limit + 1)
+
+
+def build_page(rows, page: PageParams, *keys) -> dict:
+    rows = list(rows)
+    next_cursor = None
+
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
+    return {"items": rows, "next_cursor": next_cursor}
@@ -0,0 +1,90 @@
+import enum
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.db.session import SessionLocal, AsyncSessionLocal
+
+
+class StreamFormat(str, enum.Enum):
+    json = "json"
+    ndjson = "ndjson"
+
+
+_MEDIA_TYPES = {
+    StreamFormat.json: "application/json",
+    StreamFormat.ndjson: "application/x-ndjson",
+}
+
+
+class _ChunkEncoder:
+    def __init__(self, schema: type[BaseModel], fmt: StreamFormat):
+        self.schema = schema
+        self.fmt = fmt
+        self.first = True
+
+    def start(self) -> bytes:
+        return b"[" if self.fmt == StreamFormat.json else b""
+
+    def encode(self, rows) -> bytes:
+        lines = [self.schema.model_validate(row).model_dump_json() for row in rows]
+        if self.fmt == StreamFormat.ndjson:
+            return ("\n".join(lines) + "\n").encode()
+
+        prefix = "" if self.first else ","
+        self.first = False
+        return (prefix + ",".join(lines)).encode()
+
+    def end(self) -> bytes:
+        return b"]" if self.fmt == StreamFormat.json else b""
+
+
+def _iter_chunks(statement, encoder: _ChunkEncoder):
+    # The request's own session is closed as soon as the endpoint returns, so
+    # the generator owns a session for the lifetime of the response body.
+    db = SessionLocal()
+    try:
+        # yield_per switches to a server-side cursor, so at most one chunk of
+        # rows is ever held in memory.
+        result = db.scalars(
+            statement.execution_options(yield_per=settings.STREAM_CHUNK_SIZE)
+        )
+        yield encoder.start()
+        for rows in result.partitions():
+            yield encoder.encode(rows)
+        yield encoder.end()
+    finally:
+        db.close()
+
+
+async def _aiter_chunks(statement, encoder: _ChunkEncoder):
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(
+            statement.execution_options(yield_per=settings.STREAM_CHUNK_SIZE)
+        )
+        yield encoder.start()
+        async for rows in result.partitions():
+            yield encoder.encode(rows)
+        yield encoder.end()
+
+
+def stream_query(query, schema: type[BaseModel], fmt: StreamFormat) -> StreamingResponse:
+    """
+    Streams every row matched by query as a JSON array or NDJSON, chunk by chunk,
+    instead of materialising the whole result set.
+    """
+    return StreamingResponse(
+        _iter_chunks(query.statement, _ChunkEncoder(schema, fmt)),
+        media_type=_MEDIA_TYPES[fmt],
+    )
+
+
+def stream_select(statement, schema: type[BaseModel], fmt: StreamFormat) -> StreamingResponse:
+    """
+    Async counterpart of stream_query for routes on the async session.
+    """
+    return StreamingResponse(
+        _aiter_chunks(statement, _ChunkEncoder(schema, fmt)),
+        media_type=_MEDIA_TYPES[fmt],
+    )
@@ -1,9 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, func, update, insert, case, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.api.pagination import PageParams, get_page_params, apply_keyset, build_page
+from app.core.config import settings
+from app.db.session import get_db, get_async_db
 from app.core.security import (
     get_current_user,
     ROLE_APPROVER,
@@ -12,16 +16,47 @@ from app.core.security import (
 from app.models.project import Project, ProjectVersion
 from app.models.approval import ApprovalEvent
 from app.models.common import ProjectStatus, ApprovalAction
-from app.schemas.approval import ApprovalActionIn, ApprovalEventOut
+from app.schemas.approval import (
+    ApprovalActionIn,
+    ApprovalEventOut,
+    BulkApprovalIn,
+    BulkApprovalResultOut,
+    ClaimIn,
+    PendingCountOut,
+)
+from app.schemas.pagination import Page
 from app.schemas.project import ProjectVersionOut
-from app.services.audit import record_audit
+from app.services.audit import record_audit, record_audit_many
 
 router = APIRouter()
 
 
-@router.get("/pending", response_model=list[ProjectVersionOut])
-def list_pending(
-    db: Session = Depends(get_db),
+def _pending_filter(statement, user: CurrentUser, all_reviewers: bool):
+    """
+    Pending versions assigned to the caller, or the whole queue with
+    all_reviewers. Both shapes are served by the partial pending indexes.
+    """
+    statement = statement.where(ProjectVersion.status == ProjectStatus.pending.value)
+    if not all_reviewers:
+        statement = statement.where(ProjectVersion.reviewer_id == user.user_id)
+    return statement
+
+
+def _held_by_other(version: ProjectVersion, user: CurrentUser, now: datetime) -> bool:
+    return (
+        version.claimed_by is not None
+        and version.claimed_by != user.user_id
+        and version.claim_expires_at is not None
+        and version.claim_expires_at > now
+    )
+
+
+@router.get("/pending", response_model=Page[ProjectVersionOut])
+async def list_pending(
+    all_reviewers: bool = False,
+    order: str = Query(default="asc", pattern="^(asc|desc)$"),
+    page: PageParams = Depends(get_page_params),
+    db: AsyncSession = Depends(get_async_db),
     user: CurrentUser = Depends(get_current_user),
 ):
     if user.role != ROLE_APPROVER:
@@ -30,12 +65,113 @@ def list_pending(
             detail="Only approvers can view pending approvals",
         )
 
-    return (
-        db.query(ProjectVersion)
-        .filter(ProjectVersion.status == ProjectStatus.pending.value)
-        .all()
+    keys = (ProjectVersion.submitted_at, ProjectVersion.id)
+    statement = _pending_filter(select(ProjectVersion), user, all_reviewers)
+    statement = apply_keyset(statement, page, *keys, descending=order == "desc")
+    rows = (await db.scalars(statement)).all()
+    return build_page(rows, page, *keys)
+
+
+@router.get("/pending/count", response_model=PendingCountOut)
+async def count_pending(
+    all_reviewers: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    if user.role != ROLE_APPROVER:
+        raise HTTPException(
+            status_code=403,
+            detail="Only approvers can view pending approvals",
+        )
+
+    statement = _pending_filter(select(func.count()), user, all_reviewers)
+    return {"count": await db.scalar(statement.select_from(ProjectVersion))}
+
+
+@router.post("/claim", response_model=list[ProjectVersionOut])
+def claim_pending(
+    payload: ClaimIn,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Leases the next unclaimed pending versions to the caller for
+    APPROVAL_LEASE_SECONDS. SKIP LOCKED lets concurrent approvers pass over
+    rows another claim is taking instead of queueing behind it.
+    """
+    if user.role != ROLE_APPROVER:
+        raise HTTPException(403, "Only approvers can claim approvals")
+
+    now = datetime.utcnow()
+    statement = _pending_filter(select(ProjectVersion), user, payload.all_reviewers)
+    versions = db.scalars(
+        statement
+        .where(
+            or_(
+                ProjectVersion.claimed_by.is_(None),
+                ProjectVersion.claim_expires_at <= now,
+            )
+        )
+        .order_by(ProjectVersion.submitted_at, ProjectVersion.id)
+        .limit(payload.limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    expires_at = now + timedelta(seconds=settings.APPROVAL_LEASE_SECONDS)
+    for version in versions:
+        version.claimed_by = user.user_id
+        version.claim_expires_at = expires_at
+
+    db.flush()
+    # serialise before commit expires the instances
+    claimed = [ProjectVersionOut.model_validate(version) for version in versions]
+    db.commit()
+    return claimed
+
+
+@router.post("/{version_id}/claim/renew", response_model=ProjectVersionOut)
+def renew_claim(
+    version_id: int,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    if user.role != ROLE_APPROVER:
+        raise HTTPException(403, "Only approvers can claim approvals")
+
+    version = db.get(ProjectVersion, version_id, with_for_update=True)
+    if version is None or version.status != ProjectStatus.pending.value:
+        raise HTTPException(400, "Project version not pending")
+
+    if version.claimed_by != user.user_id:
+        raise HTTPException(409, "Project version is not claimed by you")
+
+    # an expired lease can still be renewed as long as nobody re-claimed it
+    version.claim_expires_at = datetime.utcnow() + timedelta(
+        seconds=settings.APPROVAL_LEASE_SECONDS
     )
 
+    db.commit()
+    db.refresh(version)
+    return version
+
+
+@router.delete("/{version_id}/claim", status_code=204)
+def release_claim(
+    version_id: int,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    if user.role != ROLE_APPROVER:
+        raise HTTPException(403, "Only approvers can claim approvals")
+
+    version = db.get(ProjectVersion, version_id, with_for_update=True)
+    if version is None or version.claimed_by != user.user_id:
+        raise HTTPException(409, "Project version is not claimed by you")
+
+    version.claimed_by = None
+    version.claim_expires_at = None
+    db.commit()
+
 
 @router.post("/{version_id}/approve", response_model=ApprovalEventOut)
 def approve_project(
@@ -47,24 +183,39 @@ def approve_project(
     if user.role != ROLE_APPROVER:
         raise HTTPException(403, "Only approvers can approve")
 
-    version = db.get(ProjectVersion, version_id)
-    if version is None or version.status != ProjectStatus.pending.value:
+    # version and project in one round trip; locking the project row too
+    # serialises approvals of two versions of the same project
+    row = db.execute(
+        select(ProjectVersion, Project)
+        .join(Project, Project.id == ProjectVersion.project_id)
+        .where(ProjectVersion.id == version_id)
+        .with_for_update()
+    ).first()
+    if row is None or row.ProjectVersion.status != ProjectStatus.pending.value:
         raise HTTPException(400, "Project version not pending")
+    version, project = row
+
+    if _held_by_other(version, user, datetime.utcnow()):
+        raise HTTPException(409, "Project version is claimed by another approver")
 
     # Make it approved and active
     version.status = ProjectStatus.approved.value
     version.approved_at = datetime.utcnow()
     version.is_active = True
-
-    project = db.get(Project, version.project_id)
+    version.claimed_by = None
+    version.claim_expires_at = None
 
     # deactivate previous active version
     if project.active_version_id and project.active_version_id != version.id:
-        previous = db.get(ProjectVersion, project.active_version_id)
-        if previous:
-            previous.is_active = False
+        db.execute(
+            update(ProjectVersion)
+            .where(ProjectVersion.id == project.active_version_id)
+            .values(is_active=False)
+        )
 
     project.active_version_id = version.id
+    # the project's searchable name follows its active version
+    project.name = version.project_name
 
     event = ApprovalEvent(
         project_version_id=version.id,
@@ -99,13 +250,18 @@ def reject_project(
     if user.role != ROLE_APPROVER:
         raise HTTPException(403, "Only approvers can reject")
 
-    version = db.get(ProjectVersion, version_id)
+    version = db.get(ProjectVersion, version_id, with_for_update=True)
     if version is None or version.status != ProjectStatus.pending.value:
         raise HTTPException(400, "Project version not pending")
 
+    if _held_by_other(version, user, datetime.utcnow()):
+        raise HTTPException(409, "Project version is claimed by another approver")
+
     version.status = ProjectStatus.rejected.value
     version.rejected_at = datetime.utcnow()
     version.rejection_comment = payload.comment
+    version.claimed_by = None
+    version.claim_expires_at = None
 
     event = ApprovalEvent(
         project_version_id=version.id,
@@ -128,3 +284,148 @@ def reject_project(
     db.commit()
     db.refresh(event)
     return event
+
+
+@router.post("/bulk", response_model=list[BulkApprovalResultOut])
+def bulk_decide(
+    payload: BulkApprovalIn,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Approves or rejects many versions in one transaction. Items that cannot be
+    acted on are reported individually instead of failing the batch.
+    """
+    if user.role != ROLE_APPROVER:
+        raise HTTPException(403, "Only approvers can approve or reject")
+
+    if payload.action not in (ApprovalAction.approved, ApprovalAction.rejected):
+        raise HTTPException(400, "Action must be approved or rejected")
+
+    approving = payload.action == ApprovalAction.approved
+    version_ids = list(dict.fromkeys(payload.version_ids))
+    now = datetime.utcnow()
+
+    # one round trip locks every requested row; id order avoids deadlocks
+    # between overlapping batches
+    locked = (
+        select(ProjectVersion)
+        .where(ProjectVersion.id.in_(version_ids))
+        .order_by(ProjectVersion.id)
+        .with_for_update()
+    )
+    if approving:
+        # as in approve_project, locking the project rows too serialises this
+        # batch with approvals of other versions of the same projects
+        locked = locked.join(Project, Project.id == ProjectVersion.project_id)
+    versions = {version.id: version for version in db.scalars(locked)}
+
+    results: dict[int, BulkApprovalResultOut] = {}
+    accepted: list[ProjectVersion] = []
+    project_ids: set[int] = set()
+
+    for version_id in version_ids:
+        version = versions.get(version_id)
+        if version is None or version.status != ProjectStatus.pending.value:
+            detail = "Project version not pending"
+        elif _held_by_other(version, user, now):
+            detail = "Project version is claimed by another approver"
+        elif approving and version.project_id in project_ids:
+            detail = "Another version of this project is approved in the same batch"
+        else:
+            accepted.append(version)
+            project_ids.add(version.project_id)
+            continue
+        results[version_id] = BulkApprovalResultOut(version_id=version_id, ok=False, detail=detail)
+
+    if accepted:
+        accepted_ids = [version.id for version in accepted]
+        no_sync = {"synchronize_session": False}
+
+        if approving:
+            db.execute(
+                update(ProjectVersion)
+                .where(ProjectVersion.project_id.in_(project_ids))
+                .where(ProjectVersion.is_active.is_(True))
+                .where(ProjectVersion.id.not_in(accepted_ids))
+                .values(is_active=False)
+                .execution_options(**no_sync)
+            )
+            db.execute(
+                update(ProjectVersion)
+                .where(ProjectVersion.id.in_(accepted_ids))
+                .values(
+                    status=ProjectStatus.approved.value,
+                    approved_at=now,
+                    is_active=True,
+                    claimed_by=None,
+                    claim_expires_at=None,
+                )
+                .execution_options(**no_sync)
+            )
+            db.execute(
+                update(Project)
+                .where(Project.id.in_(project_ids))
+                .values(
+                    active_version_id=case(
+                        {version.project_id: version.id for version in accepted},
+                        value=Project.id,
+                    ),
+                    name=case(
+                        {version.project_id: version.project_name for version in accepted},
+                        value=Project.id,
+                    ),
+                )
+                .execution_options(**no_sync)
+            )
+        else:
+            db.execute(
+                update(ProjectVersion)
+                .where(ProjectVersion.id.in_(accepted_ids))
+                .values(
+                    status=ProjectStatus.rejected.value,
+                    rejected_at=now,
+                    rejection_comment=payload.comment,
+                    claimed_by=None,
+                    claim_expires_at=None,
+                )
+                .execution_options(**no_sync)
+            )
+
+        events = db.execute(
+            insert(ApprovalEvent).returning(
+                ApprovalEvent.id,
+                ApprovalEvent.project_version_id,
+            ),
+            [
+                {
+                    "project_version_id": version_id,
+                    "action": payload.action.value,
+                    "actor_id": user.user_id,
+                    "comment": payload.comment,
+                    "created_at": now,
+                }
+                for version_id in accepted_ids
+            ],
+        ).all()
+
+        record_audit_many(
+            db,
+            entity="project_version",
+            action="approve" if approving else "reject",
+            user_id=user.user_id,
+            entries=[
+                (str(version_id), {"comment": payload.comment, "bulk": True})
+                for version_id in accepted_ids
+            ],
+        )
+
+        for event in events:
+            results[event.project_version_id] = BulkApprovalResultOut(
+                version_id=event.project_version_id,
+                ok=True,
+                event_id=event.id,
+            )
+
+    db.commit()
+    return [results[version_id] for version_id in version_ids]
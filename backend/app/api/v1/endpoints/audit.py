@@ -1,28 +1,72 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
 
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import PageParams, get_page_params, apply_keyset, build_page
+from app.api.streaming import StreamFormat, stream_select
+from app.db.session import get_async_db
 from app.models.audit import AuditLog
 from app.schemas.audit import AuditLogOut
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[AuditLogOut])
-def list_audit(
+def _utc_naive(value: datetime) -> datetime:
+    # created_at is stored as naive UTC
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@router.get("", response_model=Page[AuditLogOut])
+async def list_audit(
     entity_type: str | None = None,
     entity_id: str | None = None,
-    db: Session = Depends(get_db),
+    actor_id: int | None = None,
+    action: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    stream: StreamFormat | None = None,
+    page: PageParams = Depends(get_page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    query = db.query(AuditLog)
+    """
+    Newest first. `since` is inclusive and `until` exclusive; a time window
+    keeps the scan to the partitions and BRIN ranges it covers.
+    """
+    statement = select(AuditLog)
 
     if entity_type is not None:
-        query = query.filter(AuditLog.entity_type == entity_type)
+        statement = statement.where(AuditLog.entity_type == entity_type)
 
     if entity_id is not None:
-        query = query.filter(AuditLog.entity_id == entity_id)
-    return (
-        query
-        .order_by(AuditLog.created_at.desc())
-        .all()
-    )
+        statement = statement.where(AuditLog.entity_id == entity_id)
+
+    if actor_id is not None:
+        statement = statement.where(AuditLog.actor_id == actor_id)
+
+    if action is not None:
+        statement = statement.where(AuditLog.action == action)
+
+    if since is not None:
+        since = _utc_naive(since)
+        statement = statement.where(AuditLog.created_at >= since)
+
+    if until is not None:
+        until = _utc_naive(until)
+        statement = statement.where(AuditLog.created_at < until)
+
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(400, "since must be earlier than until")
+
+    keys = (AuditLog.created_at, AuditLog.id)
+
+    if stream:
+        return stream_select(statement.order_by(*(key.desc() for key in keys)), AuditLogOut, stream)
+
+    statement = apply_keyset(statement, page, *keys, descending=True)
+    rows = (await db.scalars(statement)).all()
+    return build_page(rows, page, *keys)
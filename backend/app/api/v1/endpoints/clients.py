@@ -1,9 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.orm import Session
 
+from app.api.etag import etag_matches, make_etag, not_modified, set_validators
+from app.api.pagination import PageParams, get_page_params, apply_keyset, build_page
+from app.api.streaming import StreamFormat, stream_query
 from app.db.session import get_db
 from app.schemas.client import ClientCreate, ClientOut
+from app.schemas.imports import ImportResultOut
+from app.schemas.pagination import Page
 from app.models.client import Client
+from app.services.search import build_search_page, search_clients
 
 router = APIRouter()
 
@@ -24,15 +39,54 @@ def create_client(
     return client
 
 
-@router.get("", response_model=list[ClientOut])
-def list_clients(db: Session = Depends(get_db)):
-    # keep  this simple; add pagination later
-    return db.query(Client).all()
+@router.post("/import", response_model=ImportResultOut)
+def import_clients_csv(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    """
+    CSV with a header row of ClientCreate fields. Valid rows are loaded in
+    batches; rejected rows are listed by line number in the report.
+    """
+    # imported here so the csv/batching machinery stays off the cold-start path
+    from app.services.imports import InvalidImportFile, import_clients
+
+    try:
+        return import_clients(db, file.file)
+    except InvalidImportFile as exc:
+        raise HTTPException(400, str(exc))
+
+
+@router.get("", response_model=Page[ClientOut])
+def list_clients(
+    stream: StreamFormat | None = None,
+    page: PageParams = Depends(get_page_params),
+    db: Session = Depends(get_db),
+):
+    if stream:
+        return stream_query(db.query(Client).order_by(Client.id), ClientOut, stream)
+
+    query = apply_keyset(db.query(Client), page, Client.id)
+    return build_page(query.all(), page, Client.id)
+
+
+@router.get("/search", response_model=Page[ClientOut])
+def search_clients_endpoint(
+    q: str = Query(min_length=1, max_length=100),
+    page: PageParams = Depends(get_page_params),
+    db: Session = Depends(get_db),
+):
+    """Ranked match on legal entity name, GST number and contact email."""
+    search = search_clients(q, db.get_bind().dialect.name)
+    statement = apply_keyset(search.statement, page, *search.keys, descending=True)
+    return build_search_page(db.execute(statement).all(), page, search)
 
 
 @router.get("/{client_id}", response_model=ClientOut)
 def get_client(
     client_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     client = db.get(Client, client_id)
@@ -43,4 +97,9 @@ def get_client(
             detail="Client not found",
         )
 
+    etag = make_etag("client", client.id, client.updated_at.isoformat())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_validators(response, etag, client.updated_at)
+
     return client
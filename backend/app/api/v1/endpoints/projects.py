@@ -4,12 +4,21 @@ from fastapi import (
     APIRouter,
     Depends,
     HTTPException,
+    Query,
+    Request,
+    Response,
     UploadFile,
     File,
     Form,
 )
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import func, select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.api.etag import etag_matches, make_etag, not_modified, set_validators
+from app.api.pagination import PageParams, get_page_params, apply_keyset, build_page
+from app.api.streaming import StreamFormat, stream_select
+from app.core.config import settings
+from app.db.session import get_db, get_async_db
 from app.core.security import (
     get_current_user,
     ROLE_CREATOR,
@@ -21,31 +30,37 @@ from app.models.job_category import JobCategory
 from app.models.common import ProjectStatus
 from app.schemas.project import (
     ProjectCreate,
+    ProjectFullOut,
     ProjectOut,
     ProjectVersionOut,
     ProjectUpdate,
 )
 from app.schemas.job_category import JobCategoryCreate, JobCategoryOut
 from app.schemas.contract import ContractOut
-from app.services.storage import storage
+from app.schemas.imports import ImportResultOut
+from app.schemas.pagination import Page
+from app.services.search import build_search_page, search_projects
+from app.services.storage import storage, UploadTooLarge
 from app.services.audit import record_audit
+from app.services.rate_cards import rate_card_cache
 
 router = APIRouter()
 
 
+EDITABLE_STATES = [
+    ProjectStatus.draft.value,
+    ProjectStatus.rejected.value,
+]
+
+
 def _get_latest_editable_version(db: Session, project_id: int) -> ProjectVersion | None:
     """
     Returns the most recent draft/rejected version that can still be edited.
     """
-    editable_states = [
-        ProjectStatus.draft.value,
-        ProjectStatus.rejected.value,
-    ]
-
     return (
         db.query(ProjectVersion)
         .filter(ProjectVersion.project_id == project_id)
-        .filter(ProjectVersion.status.in_(editable_states))
+        .filter(ProjectVersion.status.in_(EDITABLE_STATES))
         .order_by(ProjectVersion.version_number.desc())
         .first()
     )
@@ -101,42 +116,178 @@ def create_project(
     return project
 
 
-@router.get("", response_model=list[ProjectOut])
-def list_projects(
+@router.post("/import", response_model=ImportResultOut)
+def import_projects_ndjson(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    """
+    NDJSON upload, one project per line: the create_project fields plus an
+    optional job_categories list. Each becomes a project with a version 1
+    draft; rejected lines are listed in the report.
+    """
+    if user.role != ROLE_CREATOR:
+        raise HTTPException(403, "Only creators can create projects")
+
+    # imported here so the NDJSON/batching machinery stays off the cold-start path
+    from app.services.imports import import_projects
+
+    return import_projects(db, file.file, user.user_id)
+
+
+@router.get("", response_model=Page[ProjectOut])
+async def list_projects(
     status: str | None = None,
     client_id: int | None = None,
     creator_id: int | None = None,
-    db: Session = Depends(get_db),
+    stream: StreamFormat | None = None,
+    page: PageParams = Depends(get_page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    query = db.query(Project)
+    statement = select(Project)
 
     if client_id is not None:
-        query = query.filter(Project.client_id == client_id)
+        statement = statement.where(Project.client_id == client_id)
 
     if creator_id is not None:
-        query = query.filter(Project.created_by == creator_id)
+        statement = statement.where(Project.created_by == creator_id)
 
     if status:
-        query = query.join(ProjectVersion).filter(ProjectVersion.status == status)
+        # EXISTS rather than a join: no duplicate projects to skew the keyset
+        statement = statement.where(Project.versions.any(ProjectVersion.status == status))
+
+    if stream:
+        return stream_select(statement.order_by(Project.id), ProjectOut, stream)
 
-    return query.all()
+    statement = apply_keyset(statement, page, Project.id)
+    rows = (await db.scalars(statement)).all()
+    return build_page(rows, page, Project.id)
+
+
+@router.get("/search", response_model=Page[ProjectOut])
+async def search_projects_endpoint(
+    q: str = Query(min_length=1, max_length=100),
+    page: PageParams = Depends(get_page_params),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Ranked match on project code and name."""
+    search = search_projects(q, db.get_bind().dialect.name)
+    statement = apply_keyset(search.statement, page, *search.keys, descending=True)
+    rows = (await db.execute(statement)).all()
+    return build_search_page(rows, page, search)
 
 
 @router.get("/{project_id}", response_model=ProjectOut)
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    project = db.get(Project, project_id)
+async def get_project(
+    project_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(404, "Project not found")
+
+    etag = make_etag("project", project.id, project.updated_at.isoformat())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_validators(response, etag, project.updated_at)
     return project
 
 
-@router.get("/{project_id}/versions", response_model=list[ProjectVersionOut])
-def list_versions(project_id: int, db: Session = Depends(get_db)):
-    return (
-        db.query(ProjectVersion)
-        .filter(ProjectVersion.project_id == project_id)
-        .all()
+@router.get("/{project_id}/full", response_model=ProjectFullOut)
+async def get_project_full(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Project, client, active and latest editable versions with their contracts
+    and job categories (plus rate cards), in four queries regardless of size.
+    """
+    project = await db.scalar(
+        select(Project)
+        .options(joinedload(Project.client))
+        .where(Project.id == project_id)
+    )
+    if not project:
+        raise HTTPException(404, "Project not found")
+
+    latest_editable_id = (
+        select(ProjectVersion.id)
+        .where(ProjectVersion.project_id == project_id)
+        .where(ProjectVersion.status.in_(EDITABLE_STATES))
+        .order_by(ProjectVersion.version_number.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    versions = (
+        await db.scalars(
+            select(ProjectVersion)
+            .where(
+                (ProjectVersion.id == project.active_version_id)
+                | (ProjectVersion.id == latest_editable_id)
+            )
+            .options(
+                selectinload(ProjectVersion.contracts),
+                selectinload(ProjectVersion.job_categories).joinedload(JobCategory.rate_card),
+            )
+        )
+    ).all()
+
+    active = next((v for v in versions if v.id == project.active_version_id), None)
+    editable = next((v for v in versions if v.status in EDITABLE_STATES), None)
+
+    return {
+        "project": project,
+        "client": project.client,
+        "active_version": active,
+        "editable_version": editable,
+    }
+
+
+@router.get("/{project_id}/versions", response_model=Page[ProjectVersionOut])
+async def list_versions(
+    project_id: int,
+    request: Request,
+    response: Response,
+    stream: StreamFormat | None = None,
+    page: PageParams = Depends(get_page_params),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # any insert or update moves max(updated_at) or count(), so this one
+    # aggregate is enough to answer If-None-Match without loading the rows
+    last_modified, total = (
+        await db.execute(
+            select(func.max(ProjectVersion.updated_at), func.count())
+            .where(ProjectVersion.project_id == project_id)
+        )
+    ).one()
+    etag = make_etag(
+        "versions",
+        project_id,
+        last_modified.isoformat() if last_modified else None,
+        total,
+        stream.value if stream else None,
+        page.cursor,
+        page.limit,
     )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    statement = select(ProjectVersion).where(ProjectVersion.project_id == project_id)
+
+    if stream:
+        streaming = stream_select(
+            statement.order_by(ProjectVersion.version_number),
+            ProjectVersionOut,
+            stream,
+        )
+        set_validators(streaming, etag, last_modified)
+        return streaming
+
+    set_validators(response, etag, last_modified)
+
+    statement = apply_keyset(statement, page, ProjectVersion.version_number)
+    rows = (await db.scalars(statement)).all()
+    return build_page(rows, page, ProjectVersion.version_number)
 
 
 @router.put("/{project_id}/draft", response_model=ProjectVersionOut)
@@ -169,7 +320,7 @@ def update_draft(
         entity_id=str(version.id),
         action="update",
         user_id=user.user_id,
-        meta=payload.model_dump(),
+        meta=payload.model_dump(mode="json"),
     )
 
     db.commit()
@@ -196,6 +347,7 @@ def create_new_version(
         db.query(ProjectVersion.version_number)
         .filter(ProjectVersion.project_id == project_id)
         .order_by(ProjectVersion.version_number.desc())
+        .limit(1)
         .scalar()
     )
 
@@ -213,6 +365,7 @@ def create_new_version(
     )
 
     db.add(new_version)
+    db.flush()
 
     record_audit(
         db,
@@ -281,9 +434,18 @@ def upload_contract(
     if user.role != ROLE_CREATOR:
         raise HTTPException(403, "Only creators can upload contracts")
 
-    content = file.file.read()
+    if file.size is not None and file.size > settings.MAX_UPLOAD_BYTES:
+        raise HTTPException(413, "Contract file is too large")
+
     storage_key = f"{project_id}/{version_id}/{file.filename}"
-    storage.save(storage_key, content)
+    try:
+        stored = storage.save_stream(
+            storage_key,
+            file.file,
+            max_bytes=settings.MAX_UPLOAD_BYTES,
+        )
+    except UploadTooLarge:
+        raise HTTPException(413, "Contract file is too large")
 
     contract = ContractDocument(
         project_version_id=version_id,
@@ -292,10 +454,13 @@ def upload_contract(
         valid_till=date.fromisoformat(valid_till),
         s3_key=storage_key,
         filename=file.filename,
+        size_bytes=stored.size,
+        checksum_sha256=stored.sha256,
         uploaded_at=datetime.utcnow(),
     )
 
     db.add(contract)
+    db.flush()
 
     record_audit(
         db,
@@ -325,16 +490,37 @@ def add_job_categories(
     if user.role != ROLE_CREATOR:
         raise HTTPException(403, "Only creators can add job categories")
 
-    categories: list[JobCategory] = []
-
-    for item in payload:
-        category = JobCategory(
-            project_version_id=version_id,
-            name=item.name,
-            rate_card_id=item.rate_card_id,
-        )
-        db.add(category)
-        categories.append(category)
+    version = db.get(ProjectVersion, version_id)
+    if version is None or version.project_id != project_id:
+        raise HTTPException(404, "Project version not found")
+
+    # validated against the rate card cache; ids it lacks cost at most one IN query,
+    # and ids known to be missing none until the TTL runs out
+    rate_card_ids = {item.rate_card_id for item in payload}
+    known = rate_card_cache.get_many(db, rate_card_ids)
+    missing_ids = sorted(rate_card_ids - known.keys())
+    if missing_ids:
+        raise HTTPException(400, f"Unknown rate card ids: {missing_ids}")
+
+    categories = []
+    if payload:
+        # one multi-row INSERT ... RETURNING; plain rows, so nothing to refresh
+        categories = db.execute(
+            insert(JobCategory).returning(
+                JobCategory.id,
+                JobCategory.project_version_id,
+                JobCategory.name,
+                JobCategory.rate_card_id,
+            ),
+            [
+                {
+                    "project_version_id": version_id,
+                    "name": item.name,
+                    "rate_card_id": item.rate_card_id,
+                }
+                for item in payload
+            ],
+        ).all()
 
     record_audit(
         db,
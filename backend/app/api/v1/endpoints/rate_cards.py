@@ -1,16 +1,44 @@
-from fastapi import APIRouter
-from app.schemas.job_category import RateCardOut
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.etag import etag_matches, not_modified
+from app.db.session import get_db
+from app.models.job_category import RateCard
+from app.schemas.job_category import RateCardCreate, RateCardOut
+from app.services.rate_cards import rate_card_cache
 
 router = APIRouter()
 
-# using  mocked data for now
-MOCK_RATE_CARDS = [
-    {"id": 1, "name": "Standard Dev", "rate_per_hour": "75", "currency": "USD"},
-    {"id": 2, "name": "Senior Dev", "rate_per_hour": "120", "currency": "USD"},
-    {"id": 3, "name": "QA", "rate_per_hour": "60", "currency": "USD"},  # qa is cheaper
-]
+
+@router.post("", response_model=RateCardOut)
+def create_rate_card(payload: RateCardCreate, db: Session = Depends(get_db)):
+    rate_card = RateCard(**payload.model_dump())
+    db.add(rate_card)
+    db.commit()
+    db.refresh(rate_card)
+
+    rate_card_cache.invalidate()
+    return rate_card
 
 
 @router.get("", response_model=list[RateCardOut])
-def list_rate_cards():
-    return MOCK_RATE_CARDS
+def list_rate_cards(request: Request, db: Session = Depends(get_db)):
+    snapshot = rate_card_cache.snapshot(db)
+
+    if etag_matches(request, snapshot.etag):
+        return not_modified(snapshot.etag)
+
+    # body is serialised once per cache load, not per request
+    return Response(
+        content=snapshot.body,
+        media_type="application/json",
+        headers={"ETag": snapshot.etag},
+    )
+
+
+@router.get("/{rate_card_id}", response_model=RateCardOut)
+def get_rate_card(rate_card_id: int, db: Session = Depends(get_db)):
+    rate_card = rate_card_cache.get(db, rate_card_id)
+    if rate_card is None:
+        raise HTTPException(404, "Rate card not found")
+    return rate_card
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from app.api.pagination import PageParams, get_page_params, apply_keyset, build_page
 from app.db.session import get_db
 from app.schemas.user import UserCreate, UserOut
+from app.schemas.pagination import Page
 from app.models.user import User
 
 router = APIRouter()
@@ -16,6 +18,10 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db)):
     return user
 
 
-@router.get('', response_model=list[UserOut])
-def list_users(db: Session = Depends(get_db)):
-    return db.query(User).all()
+@router.get('', response_model=Page[UserOut])
+def list_users(
+    page: PageParams = Depends(get_page_params),
+    db: Session = Depends(get_db),
+):
+    query = apply_keyset(db.query(User), page, User.id)
+    return build_page(query.all(), page, User.id)
@@ -0,0 +1,287 @@
+"""
+Per-route request metrics in Prometheus text format.
+
+Each route's ASGI app is wrapped once at startup, so the templated path and its
+label string are fixed per route instead of being built per request. The
+wrappers run on the event loop thread (sync endpoints only run their body in
+the threadpool), so the counters are plain ints without locks; each worker
+aggregates its own. With METRICS_MULTIPROC_DIR set a background thread in every
+worker writes a snapshot there each METRICS_WRITE_INTERVAL_SECONDS, and /metrics
+sums them. A scrape folds the counters of exited workers into one persisted
+snapshot (their gauges are dropped), so totals carry across worker restarts.
+"""
+import fcntl
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable
+
+from starlette.routing import Route
+
+from app.core.config import settings
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# counters of exited workers, summed, in METRICS_MULTIPROC_DIR
+EXITED_SNAPSHOT = 'exited.json'
+
+# (name, 'gauge' | 'counter', labels, value) read from the process at scrape time
+Sample = tuple[str, str, dict, float]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: dict) -> str:
+    return ','.join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+class RouteMetrics:
+    __slots__ = ('method', 'route', 'buckets', 'sum', 'count', 'in_flight', 'statuses')
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        # one slot per bucket plus +Inf; cumulated when rendered
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.in_flight = 0
+        self.statuses: dict[int, int] = {}
+
+    def observe(self, seconds: float, status: int) -> None:
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def snapshot(self) -> dict:
+        return {
+            'method': self.method,
+            'route': self.route,
+            'buckets': list(self.buckets),
+            'sum': self.sum,
+            'count': self.count,
+            'in_flight': self.in_flight,
+            'statuses': {str(code): n for code, n in self.statuses.copy().items()},
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, multiproc_dir: str | None = None, write_interval: float = 1.0):
+        self.routes: list[RouteMetrics] = []
+        self.collectors: list[Callable[[], Iterable[Sample]]] = []
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self.write_interval = write_interval
+        self._writer = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def instrument(self, app) -> None:
+        """Wraps every route already registered on app; call after the last include_router."""
+        for route in app.router.routes:
+            if not isinstance(route, Route):
+                continue
+            # starlette adds HEAD to every GET route
+            methods = set(route.methods or ()) - {'HEAD'} or set(route.methods or ())
+            metrics = RouteMetrics(','.join(sorted(methods)), route.path)
+            self.routes.append(metrics)
+            route.app = self._timed(route.app, metrics)
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        self.collectors.append(collector)
+
+    def _timed(self, app, metrics: RouteMetrics):
+        async def timed(scope, receive, send):
+            status = 500
+
+            async def send_with_status(message):
+                nonlocal status
+                if message['type'] == 'http.response.start':
+                    status = message['status']
+                await send(message)
+
+            if self.multiproc_dir is not None and self._writer is None:
+                self._start_writer()
+            metrics.in_flight += 1
+            start = time.perf_counter()
+            try:
+                await app(scope, receive, send_with_status)
+            finally:
+                metrics.in_flight -= 1
+                metrics.observe(time.perf_counter() - start, status)
+
+        return timed
+
+    def snapshot(self) -> dict:
+        samples = [sample for collector in self.collectors for sample in collector()]
+        return {
+            'pid': os.getpid(),
+            'routes': [metrics.snapshot() for metrics in self.routes],
+            'samples': [[name, kind, labels, value] for name, kind, labels, value in samples],
+        }
+
+    def _start_writer(self) -> None:
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name='metrics-writer', daemon=True)
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        while not self._stop.wait(self.write_interval):
+            self.write_snapshot()
+
+    def write_snapshot(self) -> None:
+        self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+        target = self.multiproc_dir / f'{os.getpid()}.json'
+        partial = target.with_suffix('.tmp')
+        partial.write_text(json.dumps(self.snapshot()))
+        os.replace(partial, target)
+
+    def _snapshots(self) -> list[dict]:
+        own = self.snapshot()
+        if self.multiproc_dir is None:
+            return [own]
+        # live workers rewrite their file every write_interval
+        stale_before = time.time() - max(10 * self.write_interval, 30)
+        for path in self.multiproc_dir.glob('*.json'):
+            if path.name == EXITED_SNAPSHOT or path.stem == str(own['pid']):
+                continue
+            try:
+                if not (path.stem.isdigit() and _alive(int(path.stem))) or path.stat().st_mtime < stale_before:
+                    # an exited worker (or an earlier run whose pid was reused)
+                    self._fold_exited(path)
+            except OSError:
+                continue
+
+        snapshots = [own]
+        # shared: a concurrent fold must not be seen half done (counted twice or not at all)
+        with self._dir_lock(fcntl.LOCK_SH):
+            for path in self.multiproc_dir.glob('*.json'):
+                if path.stem == str(own['pid']):
+                    continue
+                try:
+                    snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    # replaced or removed mid-read; the next scrape picks it up
+                    continue
+        return snapshots
+
+    @contextmanager
+    def _dir_lock(self, operation: int):
+        with open(self.multiproc_dir / '.lock', 'a') as lock:
+            fcntl.flock(lock, operation)
+            yield
+
+    def _fold_exited(self, path: Path) -> None:
+        """
+        Adds an exited worker's counters to EXITED_SNAPSHOT and removes its file,
+        so totals never go backwards; its gauges are dropped. The directory lock
+        keeps two scraping workers from folding the same file twice.
+        """
+        exited_path = self.multiproc_dir / EXITED_SNAPSHOT
+        with self._dir_lock(fcntl.LOCK_EX):
+            try:
+                snapshot = json.loads(path.read_text())
+            except FileNotFoundError:
+                # folded by another worker while we waited for the lock
+                return
+            except ValueError:
+                path.unlink(missing_ok=True)
+                return
+            folded = [snapshot]
+            if exited_path.exists():
+                folded.append(json.loads(exited_path.read_text()))
+            partial = exited_path.with_suffix('.tmp')
+            partial.write_text(json.dumps(_combine(folded, counters_only=True)))
+            os.replace(partial, exited_path)
+            path.unlink()
+
+    def render(self) -> str:
+        combined = _combine(self._snapshots())
+        routes = {(entry['method'], entry['route']): entry for entry in combined['routes']}
+        samples: dict[tuple[str, str], dict[str, float]] = {}
+        for name, kind, labels, value in combined['samples']:
+            samples.setdefault((name, kind), {})[_labels(labels)] = value
+
+        lines = [
+            '# HELP http_request_duration_seconds Request latency by route template.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for (method, route), total in routes.items():
+            labels = _labels({'method': method, 'route': route})
+            cumulative = 0
+            for bound, n in zip((*BUCKETS, '+Inf'), total['buckets']):
+                cumulative += n
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {total["sum"]}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {total["count"]}')
+
+        lines += ['# HELP http_requests_in_flight Requests being handled.', '# TYPE http_requests_in_flight gauge']
+        for (method, route), total in routes.items():
+            lines.append(f'http_requests_in_flight{{{_labels({"method": method, "route": route})}}} {total["in_flight"]}')
+
+        lines += ['# HELP http_requests_total Responses by status code.', '# TYPE http_requests_total counter']
+        for (method, route), total in routes.items():
+            labels = _labels({'method': method, 'route': route})
+            for code, n in sorted(total['statuses'].items()):
+                lines.append(f'http_requests_total{{{labels},status="{code}"}} {n}')
+
+        for (name, kind), family in samples.items():
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in family.items():
+                lines.append(f'{name}{{{labels}}} {value}' if labels else f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def close(self) -> None:
+        if self.multiproc_dir is None:
+            return
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+        self.write_snapshot()
+
+
+def _combine(snapshots: list[dict], counters_only: bool = False) -> dict:
+    """Sums snapshots into one; counters_only zeroes in-flight and drops gauge samples."""
+    routes: dict[tuple[str, str], dict] = {}
+    samples: dict[tuple[str, str, str], list] = {}
+    for snapshot in snapshots:
+        for entry in snapshot['routes']:
+            total = routes.setdefault((entry['method'], entry['route']), {
+                'method': entry['method'], 'route': entry['route'], 'buckets': [0] * len(entry['buckets']),
+                'sum': 0.0, 'count': 0, 'in_flight': 0, 'statuses': {},
+            })
+            total['buckets'] = [a + b for a, b in zip(total['buckets'], entry['buckets'])]
+            total['sum'] += entry['sum']
+            total['count'] += entry['count']
+            if not counters_only:
+                total['in_flight'] += entry['in_flight']
+            for code, n in entry['statuses'].items():
+                total['statuses'][code] = total['statuses'].get(code, 0) + n
+        for name, kind, labels, value in snapshot['samples']:
+            if counters_only and kind != 'counter':
+                continue
+            sample = samples.setdefault((name, kind, _labels(labels)), [name, kind, labels, 0])
+            sample[3] += value
+    return {'pid': None, 'routes': list(routes.values()), 'samples': list(samples.values())}
+
+
+def _alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+request_metrics = MetricsRegistry(settings.METRICS_MULTIPROC_DIR, settings.METRICS_WRITE_INTERVAL_SECONDS)
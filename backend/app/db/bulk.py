@@ -0,0 +1,70 @@
+import io
+import json
+from datetime import date, datetime
+from typing import Iterable, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        value = 't' if value else 'f'
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return (
+        value.replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def copy_values(connection: Connection, table: str, columns: list[str], rows: Iterable[Sequence]) -> None:
+    """
+    COPY ... FROM STDIN of value sequences in `columns` order on a Core
+    connection. Driver errors are raised as the matching sqlalchemy.exc class.
+    Postgres only.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    dbapi = connection.dialect.loaded_dbapi
+    statement = f'COPY {table} ({", ".join(columns)}) FROM STDIN'
+    with connection.connection.dbapi_connection.cursor() as cursor:
+        try:
+            cursor.copy_expert(statement, buffer)
+        except dbapi.Error as exc:
+            # the raw cursor bypasses SQLAlchemy; wrap like Connection.execute does
+            # so callers can catch IntegrityError / DataError either way
+            raise DBAPIError.instance(statement, None, exc, dbapi.Error, dialect=connection.dialect) from exc
+
+
+def copy_rows(db: Session, table, rows: list[dict]) -> None:
+    """
+    Loads rows with COPY ... FROM STDIN on the session's current connection, so
+    it commits or rolls back with the rest of the transaction. Postgres only.
+    """
+    columns = list(rows[0])
+    copy_values(db.connection(), table.name, columns, ([row[column] for column in columns] for row in rows))
+
+
+def insert_rows(db: Session, model, rows: list[dict]) -> None:
+    """COPY on Postgres, a single executemany INSERT everywhere else."""
+    if not rows:
+        return
+    if db.get_bind().dialect.name == 'postgresql':
+        copy_rows(db, model.__table__, rows)
+    else:
+        db.execute(insert(model), rows)
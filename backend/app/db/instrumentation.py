@@ -0,0 +1,148 @@
+"""
+Per-request SQL accounting. Engine events attribute every statement to the
+request in the current context, which QueryTimingMiddleware reports as a
+Server-Timing header (omitted on streamed responses, whose headers are sent
+before their queries run). Statements slower than SQL_SLOW_QUERY_MS are logged with
+their parameters redacted, and a SELECT shape repeated SQL_N_PLUS_ONE_THRESHOLD
+times within one request is logged as a likely N+1, or raised as NPlusOneError
+when SQL_RAISE_ON_N_PLUS_ONE is set.
+"""
+import logging
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# sqlite / psycopg2 / asyncpg placeholders; expanding IN lists vary in length per call
+_PLACEHOLDER = r'(?:\?|%s|%\(\w+\)s|\$\d+)'
+_PLACEHOLDER_RUN = re.compile(rf'{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+')
+
+
+class NPlusOneError(RuntimeError):
+    pass
+
+
+class RequestQueries:
+    __slots__ = ('scope', 'count', 'seconds', 'shapes')
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: dict[str, int] = {}
+
+    @property
+    def route(self) -> str:
+        # set by the router once the request is matched
+        route = self.scope.get('route')
+        return route.path if route is not None else self.scope['path']
+
+    def repeated(self) -> list[tuple[str, int]]:
+        threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+        return [(shape, n) for shape, n in self.shapes.items() if n >= threshold]
+
+
+_current: ContextVar[RequestQueries | None] = ContextVar('request_queries', default=None)
+
+
+@lru_cache(maxsize=2048)
+def _select_shape(statement: str) -> str | None:
+    if not statement.lstrip()[:6].upper().startswith(('SELECT', 'WITH')):
+        return None
+    return _PLACEHOLDER_RUN.sub('?', ' '.join(statement.split()))
+
+
+def _redact(parameters) -> str:
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{key}=?' for key in parameters) + '}'
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f'[{len(parameters)} rows]'
+        return f'({len(parameters)} values)'
+    return '?'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current.get()
+    if queries is None:
+        return
+    queries.count += 1
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+    shape = _select_shape(statement)
+    if shape is None:
+        return
+    seen = queries.shapes[shape] = queries.shapes.get(shape, 0) + 1
+    if seen == settings.SQL_N_PLUS_ONE_THRESHOLD and settings.SQL_RAISE_ON_N_PLUS_ONE:
+        raise NPlusOneError(f'{seen} x same SELECT in {queries.route}: {shape}')
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current.get()
+    started = getattr(context, '_query_started', None)
+    if queries is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    queries.seconds += elapsed
+    if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning(
+            'slow query in %s: %.1f ms %s params=%s',
+            queries.route, elapsed * 1000, ' '.join(statement.split()), _redact(parameters),
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attributes the engine's statements to the current request (pass async engines' .sync_engine)."""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+class QueryTimingMiddleware:
+    """
+    Adds `Server-Timing: db;dur=<ms>;desc="<n> queries"` to buffered responses
+    and reports repeated SELECTs (streamed responses included).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _current.set(queries)
+
+        start = None
+
+        async def send_with_timing(message):
+            nonlocal start
+            if message['type'] == 'http.response.start':
+                # held until the first body chunk shows whether the response is streamed
+                start = message
+                return
+            if start is not None:
+                # a streamed body still runs its queries after the headers go out, so it gets no header
+                if message['type'] == 'http.response.body' and not message.get('more_body', False):
+                    headers = MutableHeaders(scope=start)
+                    headers.append('Server-Timing', f'db;dur={queries.seconds * 1000:.2f};desc="{queries.count} queries"')
+                await send(start)
+                start = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            for shape, n in queries.repeated():
+                logger.warning('possible N+1 in %s: %d x %s', queries.route, n, shape)
@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.core.config import settings
+
+POOL_PROFILE_LAMBDA = 'lambda'
+POOL_PROFILE_SERVER = 'server'
+
+
+class _CheckoutTimingMixin:
+    """Records how long callers wait for a pooled connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record_timeout()
+            raise
+        finally:
+            self.wait_stats.record_wait(time.perf_counter() - start)
+
+    @property
+    def wait_stats(self) -> 'PoolWaitStats':
+        # created lazily so pools rebuilt by dispose()/recreate() start fresh
+        stats = self.__dict__.get('_wait_stats')
+        if stats is None:
+            stats = self.__dict__.setdefault('_wait_stats', PoolWaitStats())
+        return stats
+
+    def capacity(self) -> int:
+        return self.size() + max(self._max_overflow, 0)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class PoolWaitStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+
+def pool_profile() -> str:
+    if settings.DB_POOL_PROFILE:
+        return settings.DB_POOL_PROFILE.lower()
+    # set by the Lambda runtime
+    if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+        return POOL_PROFILE_LAMBDA
+    return POOL_PROFILE_SERVER
+
+
+def _split(total: int, async_share: int | None, is_async: bool) -> int:
+    """This engine's part of a per-worker total shared by the sync and async engines."""
+    share = total // 2 if async_share is None else min(async_share, total)
+    return share if is_async else total - share
+
+
+def engine_pool_options(is_async: bool = False) -> dict:
+    """
+    create_engine / create_async_engine pool arguments for the current profile.
+
+    lambda: one container serves one request at a time and may be frozen for
+    minutes, so idle pooled connections only eat into max_connections. Use
+    NullPool, or a single recycled connection with DB_LAMBDA_REUSE_CONNECTION.
+    server: a sized QueuePool per engine. DB_POOL_SIZE / DB_MAX_OVERFLOW are
+    split between the sync engine (threadpool routes) and the async one (event
+    loop routes) so a worker holding both stays within those totals.
+    """
+    queue_pool = InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+    profile = pool_profile()
+
+    if profile == POOL_PROFILE_LAMBDA:
+        if not settings.DB_LAMBDA_REUSE_CONNECTION:
+            return {'poolclass': NullPool}
+        return {
+            'poolclass': queue_pool,
+            'pool_size': 1,
+            'max_overflow': 0,
+            'pool_timeout': settings.DB_POOL_TIMEOUT_SECONDS,
+            'pool_recycle': settings.DB_POOL_RECYCLE_SECONDS,
+        }
+
+    if profile == POOL_PROFILE_SERVER:
+        return {
+            'poolclass': queue_pool,
+            # QueuePool treats pool_size=0 as unbounded, so keep at least one
+            'pool_size': max(_split(settings.DB_POOL_SIZE, settings.DB_ASYNC_POOL_SIZE, is_async), 1),
+            'max_overflow': _split(settings.DB_MAX_OVERFLOW, settings.DB_ASYNC_MAX_OVERFLOW, is_async),
+            'pool_timeout': settings.DB_POOL_TIMEOUT_SECONDS,
+            'pool_recycle': settings.DB_POOL_RECYCLE_SECONDS,
+            'pool_use_lifo': True,
+        }
+
+    raise ValueError(f'Unknown DB_POOL_PROFILE: {profile!r}')
+
+
+def pool_status(pool) -> dict:
+    status = {'profile': pool_profile(), 'pool_class': type(pool).__name__}
+    if not isinstance(pool, _CheckoutTimingMixin):
+        return status
+
+    stats = pool.wait_stats
+    checked_out = pool.checkedout()
+    capacity = pool.capacity()
+    status.update(
+        size=pool.size(),
+        capacity=capacity,
+        checked_out=checked_out,
+        checked_in=pool.checkedin(),
+        overflow=pool.overflow(),
+        saturation=checked_out / capacity if capacity else 0.0,
+        checkouts=stats.checkouts,
+        checkout_timeouts=stats.timeouts,
+        checkout_wait_seconds_total=stats.wait_seconds_total,
+        checkout_wait_seconds_max=stats.wait_seconds_max,
+    )
+    return status
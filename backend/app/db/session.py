@@ -1,13 +1,139 @@
+import logging
+import threading
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import engine_pool_options, pool_status
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+logger = logging.getLogger(__name__)
+
+_ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+# URL query parameters the asyncpg dialect passes through to asyncpg.connect()
+_ASYNCPG_QUERY_KEYS = {'ssl', 'prepared_statement_cache_size', 'target_session_attrs'}
+
+# Engines are built on first use, not at import: create_engine pulls in the
+# DBAPI driver, which is pure cold-start cost for a Lambda that may never
+# touch the database (e.g. /health).
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_engine_lock = threading.Lock()
+
+def _async_connect_options() -> tuple[str, dict]:
+    """
+    (URL, connect_args) for the async engine. DATABASE_URL query parameters are
+    libpq's, which asyncpg does not take as keywords: sslmode becomes ssl,
+    connect_timeout and application_name are passed as connect_args, and the
+    rest are dropped with a warning (set ASYNC_DATABASE_URL to control them).
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL, {}
+    url = make_url(settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    url = url.set(drivername=_ASYNC_DRIVERS[backend])
+    connect_args = {}
+    if backend == 'postgresql' and url.query:
+        query = dict(url.query)
+        if 'sslmode' in query:
+            # asyncpg accepts the libpq mode names
+            query['ssl'] = query.pop('sslmode')
+        if 'connect_timeout' in query:
+            connect_args['timeout'] = float(query.pop('connect_timeout'))
+        if 'application_name' in query:
+            connect_args['server_settings'] = {'application_name': query.pop('application_name')}
+        dropped = sorted(set(query) - _ASYNCPG_QUERY_KEYS)
+        if dropped:
+            logger.warning('ignoring DATABASE_URL parameters asyncpg does not support: %s', ', '.join(dropped))
+        url = url.set(query={key: value for key, value in query.items() if key in _ASYNCPG_QUERY_KEYS})
+    return url.render_as_string(hide_password=False), connect_args
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(
+                    settings.DATABASE_URL,
+                    pool_pre_ping=True,
+                    **engine_pool_options(),
+                )
+                if settings.SQL_INSTRUMENTATION_ENABLED:
+                    from app.db.instrumentation import instrument_engine
+                    instrument_engine(_engine)
+    return _engine
+
+# Read-heavy routes run on the event loop instead of the threadpool.
+# The sync engine above stays for write routes, scripts and the Lambda handler.
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                url, connect_args = _async_connect_options()
+                _async_engine = create_async_engine(
+                    url,
+                    connect_args=connect_args,
+                    pool_pre_ping=True,
+                    **engine_pool_options(is_async=True),
+                )
+                if settings.SQL_INSTRUMENTATION_ENABLED:
+                    from app.db.instrumentation import instrument_engine
+                    instrument_engine(_async_engine.sync_engine)
+    return _async_engine
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to its engine the first time a session is made."""
+
+    def __init__(self, engine_factory, **kw):
+        super().__init__(**kw)
+        self._engine_factory = engine_factory
+
+    def __call__(self, **local_kw):
+        if self.kw.get('bind') is None:
+            self.configure(bind=self._engine_factory())
+        return super().__call__(**local_kw)
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    def __init__(self, engine_factory, **kw):
+        super().__init__(**kw)
+        self._engine_factory = engine_factory
+
+    def __call__(self, **local_kw):
+        if self.kw.get('bind') is None:
+            self.configure(bind=self._engine_factory())
+        return super().__call__(**local_kw)
+
+SessionLocal = _LazySessionmaker(get_engine, autocommit=False, autoflush=False)
+AsyncSessionLocal = _LazyAsyncSessionmaker(get_async_engine, autoflush=False, expire_on_commit=False)
+
+def __getattr__(name: str):
+    # keeps `from app.db.session import engine` working without eager creation
+    if name == 'engine':
+        return get_engine()
+    if name == 'async_engine':
+        return get_async_engine()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def get_pool_status() -> dict:
+    """Checkout wait and saturation for whichever engines exist so far."""
+    status = {}
+    if _engine is not None:
+        status['sync'] = pool_status(_engine.pool)
+    if _async_engine is not None:
+        status['async'] = pool_status(_async_engine.sync_engine.pool)
+    return status
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
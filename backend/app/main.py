@@ -1,10 +1,58 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, request_metrics
+from app.db.session import get_pool_status
+from app.services.audit import audit_sink
 
-app = FastAPI(title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # drain write-behind audit rows before the worker exits
+    audit_sink.close()
+    request_metrics.close()
+
+app = FastAPI(title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION, lifespan=lifespan)
 app.include_router(api_router, prefix='/api/v1')
 
+def _query_timing(app):
+    # starlette builds the middleware stack on the first request, so the
+    # instrumentation module is not imported on the cold-start path
+    from app.db.instrumentation import QueryTimingMiddleware
+    return QueryTimingMiddleware(app)
+
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    app.add_middleware(_query_timing)
+
 @app.get('/health')
 def health():
     return {'status': 'ok'}
+
+@app.get('/health/db-pool')
+def db_pool_health():
+    return get_pool_status()
+
+def _runtime_samples():
+    for engine, status in get_pool_status().items():
+        if 'checked_out' not in status:
+            continue
+        labels = {'engine': engine}
+        yield 'db_pool_checked_out', 'gauge', labels, status['checked_out']
+        yield 'db_pool_capacity', 'gauge', labels, status['capacity']
+        yield 'db_pool_checkouts_total', 'counter', labels, status['checkouts']
+        yield 'db_pool_checkout_timeouts_total', 'counter', labels, status['checkout_timeouts']
+        yield 'db_pool_checkout_wait_seconds_total', 'counter', labels, status['checkout_wait_seconds_total']
+    stats = audit_sink.stats()
+    yield 'audit_sink_queued', 'gauge', {}, stats['queued']
+    for key in ('enqueued', 'written', 'dropped', 'failed'):
+        yield f'audit_sink_{key}_total', 'counter', {}, stats[key]
+
+if settings.METRICS_ENABLED:
+    @app.get('/metrics', include_in_schema=False)
+    def metrics():
+        return Response(request_metrics.render(), media_type=CONTENT_TYPE)
+
+    request_metrics.add_collector(_runtime_samples)
+    # last: only routes registered by now are timed
+    request_metrics.instrument(app)
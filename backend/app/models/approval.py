@@ -1,8 +1,12 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Index
 from app.db.base import Base
 
 class ApprovalEvent(Base):
     __tablename__ = 'approval_events'
+    __table_args__ = (
+        Index('approval_events_project_version_id_idx', 'project_version_id'),
+        Index('approval_events_actor_id_idx', 'actor_id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_version_id = Column(Integer, ForeignKey('project_versions.id'), nullable=False)
@@ -1,14 +1,24 @@
-from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy import Column, String, DateTime, Integer, Index, JSON
 from sqlalchemy.dialects.postgresql import JSONB
 from app.db.base import Base
 
 class AuditLog(Base):
+    # schema.sql partitions this table by month on created_at (primary key
+    # (id, created_at) there); the model keeps id alone so it also runs on SQLite
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        Index('audit_logs_entity_created_at_idx', 'entity_type', 'entity_id', 'created_at'),
+        # rows arrive in created_at order, so a few-KB BRIN serves time windows
+        # that a btree over the whole table would need GBs for
+        Index('audit_logs_created_at_brin_idx', 'created_at', postgresql_using='brin'),
+        Index('audit_logs_actor_created_at_idx', 'actor_id', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     entity_type = Column(String, nullable=False)
     entity_id = Column(String, nullable=False)
     action = Column(String, nullable=False)
     actor_id = Column(Integer, nullable=False)
-    data = Column(JSONB)
+    # plain JSON off Postgres so the models also run on SQLite locally
+    data = Column(JSON().with_variant(JSONB(), 'postgresql'))
     created_at = Column(DateTime, nullable=False)
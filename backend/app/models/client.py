@@ -1,11 +1,34 @@
-from sqlalchemy import Column, String, Boolean, Integer
+from datetime import datetime
+
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Index
 from app.db.base import Base
 
 
 class Client(Base):
     __tablename__ = "clients"
+    __table_args__ = (
+        # trigram indexes behind /clients/search (ILIKE and similarity)
+        Index(
+            "clients_legal_entity_name_trgm_idx",
+            "legal_entity_name",
+            postgresql_using="gin",
+            postgresql_ops={"legal_entity_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "clients_gst_number_trgm_idx",
+            "gst_number",
+            postgresql_using="gin",
+            postgresql_ops={"gst_number": "gin_trgm_ops"},
+        ),
+        Index(
+            "clients_primary_contact_email_trgm_idx",
+            "primary_contact_email",
+            postgresql_using="gin",
+            postgresql_ops={"primary_contact_email": "gin_trgm_ops"},
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
 
     # basic client info
     legal_entity_name = Column(String, nullable=False)
@@ -20,4 +43,7 @@ class Client(Base):
     primary_contact_name = Column(String, nullable=False)
     primary_contact_designation = Column(String, nullable=True)
     primary_contact_phone = Column(String, nullable=False)
-    primary_contact_email = Column(String, nullable=False)
\ No newline at end of file
+    primary_contact_email = Column(String, nullable=False)
+
+    # bumped on every write; drives the ETag on GET /clients/{id}
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class ContractDocument(Base):
     __tablename__ = 'contract_documents'
+    __table_args__ = (
+        Index('contract_documents_project_version_id_idx', 'project_version_id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_version_id = Column(Integer, ForeignKey('project_versions.id'), nullable=False)
@@ -12,6 +15,8 @@ class ContractDocument(Base):
     valid_till = Column(Date, nullable=False)
     s3_key = Column(String, nullable=False)
     filename = Column(String, nullable=False)
+    size_bytes = Column(Integer)
+    checksum_sha256 = Column(String)
     uploaded_at = Column(DateTime, nullable=False)
 
     project_version = relationship('ProjectVersion', back_populates='contracts')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Integer
+from sqlalchemy import Column, String, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -12,6 +12,10 @@ class RateCard(Base):
 
 class JobCategory(Base):
     __tablename__ = 'job_categories'
+    __table_args__ = (
+        Index('job_categories_project_version_id_idx', 'project_version_id'),
+        Index('job_categories_rate_card_id_idx', 'rate_card_id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_version_id = Column(Integer, ForeignKey('project_versions.id'), nullable=False)
@@ -1,10 +1,30 @@
-from sqlalchemy import Column, String, Integer, Date, DateTime, Boolean, ForeignKey
+from datetime import datetime
+
+from sqlalchemy import Column, String, Integer, Date, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.models.common import ProjectStatus
 
 class Project(Base):
     __tablename__ = 'projects'
+    __table_args__ = (
+        Index('projects_client_id_idx', 'client_id'),
+        Index('projects_created_by_idx', 'created_by'),
+        Index('projects_active_version_id_idx', 'active_version_id'),
+        # trigram indexes behind /projects/search (ILIKE and similarity)
+        Index(
+            'projects_project_code_trgm_idx',
+            'project_code',
+            postgresql_using='gin',
+            postgresql_ops={'project_code': 'gin_trgm_ops'},
+        ),
+        Index(
+            'projects_name_trgm_idx',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_code = Column(String, nullable=False, unique=True)
@@ -12,6 +32,7 @@ class Project(Base):
     created_by = Column(Integer, ForeignKey('users.id'), nullable=False)
     name = Column(String, nullable=False)
     active_version_id = Column(Integer, ForeignKey('project_versions.id'))
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     client = relationship('Client')
     versions = relationship(
@@ -22,6 +43,30 @@ class Project(Base):
 
 class ProjectVersion(Base):
     __tablename__ = 'project_versions'
+    __table_args__ = (
+        # latest editable version lookup: project_id + status, newest version first
+        Index('project_versions_project_status_version_idx', 'project_id', 'status', 'version_number'),
+        # the approval queue only ever looks at pending rows: one index for
+        # each reviewer's inbox, one for the whole queue, both in keyset order
+        Index(
+            'project_versions_pending_reviewer_idx',
+            'reviewer_id',
+            'submitted_at',
+            'id',
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        Index(
+            'project_versions_pending_idx',
+            'submitted_at',
+            'id',
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        Index('project_versions_reviewer_id_idx', 'reviewer_id'),
+        Index('project_versions_creator_id_idx', 'creator_id'),
+        Index('project_versions_claimed_by_idx', 'claimed_by'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
@@ -42,6 +87,13 @@ class ProjectVersion(Base):
     rejection_comment = Column(String)
     is_active = Column(Boolean, default=False)
 
+    # approver work-queue lease, see /approvals/claim
+    claimed_by = Column(Integer, ForeignKey('users.id'))
+    claim_expires_at = Column(DateTime)
+
+    # bumped on every write (including set-based updates); drives the ETags
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     project = relationship(
         'Project',
         back_populates='versions',
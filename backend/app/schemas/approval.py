@@ -1,10 +1,28 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.models.common import ApprovalAction
 
 class ApprovalActionIn(BaseModel):
     comment: str | None = None
 
+class ClaimIn(BaseModel):
+    limit: int = Field(default=10, ge=1, le=100)
+    all_reviewers: bool = False
+
+class BulkApprovalIn(BaseModel):
+    version_ids: list[int] = Field(min_length=1, max_length=500)
+    action: ApprovalAction
+    comment: str | None = None
+
+class BulkApprovalResultOut(BaseModel):
+    version_id: int
+    ok: bool
+    event_id: int | None = None
+    detail: str | None = None
+
+class PendingCountOut(BaseModel):
+    count: int
+
 class ApprovalEventOut(BaseModel):
     id: int
     project_version_id: int
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, EmailStr
 
 class ClientBase(BaseModel):
@@ -18,6 +20,7 @@ class ClientCreate(ClientBase):
 
 class ClientOut(ClientBase):
     id: int
+    updated_at: datetime | None = None
 
     class Config:
         from_attributes = True
@@ -13,6 +13,8 @@ class ContractOut(BaseModel):
     valid_from: date
     valid_till: date
     filename: str
+    size_bytes: int | None = None
+    checksum_sha256: str | None = None
     uploaded_at: datetime
 
     class Config:
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+class ImportRowError(BaseModel):
+    line: int
+    errors: list[str]
+
+class ImportResultOut(BaseModel):
+    received: int
+    imported: int
+    failed: int
+    errors: list[ImportRowError]
+    # only the first IMPORT_MAX_ERRORS failures are listed
+    errors_truncated: bool = False
+
+    class Config:
+        from_attributes = True
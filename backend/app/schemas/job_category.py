@@ -1,11 +1,16 @@
 from pydantic import BaseModel
 
-class RateCardOut(BaseModel):
-    id: int
+class RateCardCreate(BaseModel):
     name: str
     rate_per_hour: str
     currency: str
 
+class RateCardOut(RateCardCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
+
 class JobCategoryCreate(BaseModel):
     name: str
     rate_card_id: int
@@ -18,3 +23,6 @@ class JobCategoryOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+class JobCategoryDetailOut(JobCategoryOut):
+    rate_card: RateCardOut
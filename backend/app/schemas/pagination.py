@@ -0,0 +1,8 @@
+from typing import Generic, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
@@ -1,6 +1,9 @@
 from datetime import date, datetime
 from pydantic import BaseModel
 from app.models.common import ProjectStatus
+from app.schemas.client import ClientOut
+from app.schemas.contract import ContractOut
+from app.schemas.job_category import JobCategoryCreate, JobCategoryDetailOut
 
 class ProjectBase(BaseModel):
     project_code: str
@@ -16,6 +19,9 @@ class ProjectCreate(ProjectBase):
 class ProjectUpdate(ProjectBase):
     pass
 
+class ProjectImportIn(ProjectCreate):
+    job_categories: list[JobCategoryCreate] = []
+
 class ProjectVersionOut(BaseModel):
     id: int
     project_id: int
@@ -32,6 +38,9 @@ class ProjectVersionOut(BaseModel):
     rejected_at: datetime | None
     rejection_comment: str | None
     is_active: bool
+    claimed_by: int | None = None
+    claim_expires_at: datetime | None = None
+    updated_at: datetime | None = None
 
     class Config:
         from_attributes = True
@@ -43,6 +52,17 @@ class ProjectOut(BaseModel):
     client_id: int
     created_by: int
     active_version_id: int | None
+    updated_at: datetime | None = None
 
     class Config:
         from_attributes = True
+
+class ProjectVersionDetailOut(ProjectVersionOut):
+    contracts: list[ContractOut]
+    job_categories: list[JobCategoryDetailOut]
+
+class ProjectFullOut(BaseModel):
+    project: ProjectOut
+    client: ClientOut
+    active_version: ProjectVersionDetailOut | None
+    editable_version: ProjectVersionDetailOut | None
@@ -1,15 +1,179 @@
+import atexit
+import logging
+import queue
+import threading
+import time
 from datetime import datetime
+from sqlalchemy import event
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.bulk import insert_rows
+from app.db.session import SessionLocal
 from app.models.audit import AuditLog
 
+logger = logging.getLogger(__name__)
 
-def record_audit(db: Session, entity_type: str, entity_id: str, action: str, actor_id: str, data: dict | None = None):
-    log = AuditLog(
-        entity_type=entity_type,
+AUDIT_MODE_SYNC = 'sync'
+AUDIT_MODE_WRITE_BEHIND = 'write_behind'
+
+_PENDING_KEY = 'pending_audit'
+_STOP = object()
+
+
+class AuditSink:
+    """
+    Write-behind audit writer: committed audit rows are queued in process and
+    flushed by a background thread in batches, on size or on time. The queue is
+    bounded; rows that do not fit are dropped and counted rather than blocking
+    the request.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, rows: list[dict]) -> None:
+        self._ensure_started()
+        accepted = 0
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+                accepted += 1
+            except queue.Full:
+                break
+        with self._lock:
+            self.enqueued += accepted
+            self.dropped += len(rows) - accepted
+        if accepted < len(rows):
+            logger.warning('audit queue full, dropped %d rows', len(rows) - accepted)
+
+    def flush(self) -> None:
+        """Blocks until everything queued so far has been written (or failed)."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+            }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='audit-sink', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch)
+                self._queue.task_done()
+                return
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, batch: list[dict]) -> None:
+        if not batch:
+            return
+        try:
+            with SessionLocal() as db:
+                # multi-row INSERT, or COPY on Postgres
+                insert_rows(db, AuditLog, batch)
+                db.commit()
+            with self._lock:
+                self.written += len(batch)
+        except Exception:
+            logger.exception('failed to write %d audit rows', len(batch))
+            with self._lock:
+                self.failed += len(batch)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+audit_sink = AuditSink(
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
+atexit.register(audit_sink.close)
+
+
+@event.listens_for(Session, 'after_commit')
+def _hand_off_pending_audit(session: Session) -> None:
+    rows = session.info.pop(_PENDING_KEY, None)
+    if rows:
+        audit_sink.submit(rows)
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _discard_pending_audit(session: Session, transaction) -> None:
+    # after_commit has already taken the rows on success; anything still here
+    # belongs to a transaction that was rolled back or closed
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def _audit_row(entity: str, entity_id: str, action: str, user_id: int, meta: dict | None) -> dict:
+    return dict(
+        entity_type=entity,
         entity_id=entity_id,
         action=action,
-        actor_id=actor_id,
-        data=data,
+        actor_id=user_id,
+        data=meta,
         created_at=datetime.utcnow(),
     )
-    db.add(log)
+
+
+def record_audit(db: Session, entity: str, entity_id: str, action: str, user_id: int, meta: dict | None = None):
+    row = _audit_row(entity, entity_id, action, user_id, meta)
+    if settings.AUDIT_MODE == AUDIT_MODE_WRITE_BEHIND:
+        # only handed to the sink once the business transaction commits
+        db.info.setdefault(_PENDING_KEY, []).append(row)
+        return
+    db.add(AuditLog(**row))
+
+
+def record_audit_many(db: Session, entity: str, action: str, user_id: int, entries: list[tuple[str, dict | None]]):
+    """
+    Batch form of record_audit for set-based endpoints: entries are
+    (entity_id, meta) pairs, written with one multi-row INSERT (COPY on Postgres).
+    """
+    rows = [_audit_row(entity, entity_id, action, user_id, meta) for entity_id, meta in entries]
+    if settings.AUDIT_MODE == AUDIT_MODE_WRITE_BEHIND:
+        db.info.setdefault(_PENDING_KEY, []).extend(rows)
+        return
+    insert_rows(db, AuditLog, rows)
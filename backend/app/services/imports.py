@@ -0,0 +1,298 @@
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.bulk import insert_rows
+from app.models.client import Client
+from app.models.common import ProjectStatus
+from app.models.job_category import JobCategory
+from app.models.project import Project, ProjectVersion
+from app.models.user import User
+from app.schemas.client import ClientCreate
+from app.schemas.project import ProjectImportIn
+from app.services.audit import record_audit_many
+from app.services.rate_cards import rate_card_cache
+
+
+class InvalidImportFile(ValueError):
+    pass
+
+
+@dataclass
+class ImportReport:
+    received: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+    errors_truncated: bool = False
+
+    def add_error(self, line: int, messages: list[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "errors": messages})
+        else:
+            self.errors_truncated = True
+
+
+def validation_messages(exc: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+def _batched(iterator: Iterator) -> Iterator[list]:
+    while batch := list(islice(iterator, settings.IMPORT_BATCH_SIZE)):
+        yield batch
+
+
+def read_csv_batches(
+    stream: BinaryIO,
+    required: set[str],
+    report: ImportReport,
+) -> Iterator[list[tuple[int, dict]]]:
+    """
+    Yields (line, row) batches of IMPORT_BATCH_SIZE from a binary CSV stream,
+    so only one batch is held in memory. Empty cells are dropped, letting the
+    schema defaults apply. An unreadable file stops the import at that line.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        if reader.fieldnames is None:
+            raise InvalidImportFile("CSV file is empty")
+        reader.fieldnames = [name.strip() for name in reader.fieldnames]
+        missing = required - set(reader.fieldnames)
+        if missing:
+            raise InvalidImportFile(f"Missing columns: {', '.join(sorted(missing))}")
+
+        def rows():
+            try:
+                for row in reader:
+                    yield reader.line_num, {
+                        key: value.strip()
+                        for key, value in row.items()
+                        if key is not None and value is not None and value.strip()
+                    }
+            except (csv.Error, UnicodeDecodeError) as exc:
+                report.received += 1
+                report.add_error(reader.line_num + 1, [f"Unreadable CSV: {exc}"])
+
+        yield from _batched(rows())
+    except UnicodeDecodeError as exc:
+        raise InvalidImportFile(f"CSV file is not UTF-8: {exc}")
+    finally:
+        # leave the underlying upload for its owner to close
+        text.detach()
+
+
+def import_clients(db: Session, stream: BinaryIO) -> ImportReport:
+    """
+    Validates each batch against ClientCreate, loads the valid rows with
+    insert_rows (COPY on Postgres) inside a savepoint and commits per batch. If
+    the database rejects the batch, it is retried row by row so only the
+    offending rows fail.
+    """
+    report = ImportReport()
+    required = {name for name, info in ClientCreate.model_fields.items() if info.is_required()}
+    now = datetime.utcnow()
+
+    for batch in read_csv_batches(stream, required, report):
+        valid = []
+        for line, row in batch:
+            report.received += 1
+            try:
+                client = ClientCreate.model_validate(row)
+            except ValidationError as exc:
+                report.add_error(line, validation_messages(exc))
+                continue
+            valid.append((line, {**client.model_dump(), "updated_at": now}))
+
+        imported = 0
+        if valid:
+            try:
+                with db.begin_nested():
+                    insert_rows(db, Client, [row for _, row in valid])
+                imported = len(valid)
+            except (IntegrityError, DataError):
+                for line, row in valid:
+                    try:
+                        with db.begin_nested():
+                            insert_rows(db, Client, [row])
+                        imported += 1
+                    except (IntegrityError, DataError) as exc:
+                        report.add_error(line, [f"Rejected by the database: {exc.orig}"])
+        db.commit()
+        report.imported += imported
+
+    return report
+
+
+def read_ndjson_batches(stream: BinaryIO, report: ImportReport) -> Iterator[list[tuple[int, dict]]]:
+    """(line, object) batches from a binary NDJSON stream; blank lines are skipped."""
+
+    def rows():
+        for line, raw in enumerate(stream, start=1):
+            if not raw.strip():
+                continue
+            try:
+                yield line, json.loads(raw)
+            except ValueError as exc:
+                report.received += 1
+                report.add_error(line, [f"Invalid JSON: {exc}"])
+
+    yield from _batched(rows())
+
+
+def _check_projects(db: Session, batch, report: ImportReport) -> list[tuple[int, ProjectImportIn]]:
+    """
+    Validates a batch with one query each for taken project codes, clients
+    and reviewers, plus the rate card cache. Returns the rows that passed.
+    """
+    parsed = []
+    for line, data in batch:
+        report.received += 1
+        try:
+            parsed.append((line, ProjectImportIn.model_validate(data)))
+        except ValidationError as exc:
+            report.add_error(line, validation_messages(exc))
+    if not parsed:
+        return []
+
+    items = [item for _, item in parsed]
+    taken = set(
+        db.scalars(
+            select(Project.project_code)
+            .where(Project.project_code.in_({item.project_code for item in items}))
+        )
+    )
+    client_ids = set(
+        db.scalars(select(Client.id).where(Client.id.in_({item.client_id for item in items})))
+    )
+    reviewer_ids = set(
+        db.scalars(select(User.id).where(User.id.in_({item.reviewer_id for item in items})))
+    )
+    rate_cards = rate_card_cache.get_many(
+        db, {category.rate_card_id for item in items for category in item.job_categories}
+    )
+
+    valid, seen = [], set()
+    for line, item in parsed:
+        problems = []
+        if item.project_code in taken:
+            problems.append("project_code: already exists")
+        elif item.project_code in seen:
+            problems.append("project_code: repeated in this file")
+        if item.client_id not in client_ids:
+            problems.append(f"client_id: unknown client {item.client_id}")
+        if item.reviewer_id not in reviewer_ids:
+            problems.append(f"reviewer_id: unknown user {item.reviewer_id}")
+        unknown_cards = sorted(
+            {category.rate_card_id for category in item.job_categories} - rate_cards.keys()
+        )
+        if unknown_cards:
+            problems.append(f"job_categories: unknown rate card ids {unknown_cards}")
+
+        if problems:
+            report.add_error(line, problems)
+        else:
+            seen.add(item.project_code)
+            valid.append((line, item))
+    return valid
+
+
+def _insert_projects(db: Session, items: list[ProjectImportIn], user_id: int) -> list[int]:
+    """Projects, their version 1 drafts and job categories, one statement each."""
+    projects = db.execute(
+        insert(Project).returning(Project.id, sort_by_parameter_order=True),
+        [
+            {
+                "project_code": item.project_code,
+                "client_id": item.client_id,
+                "created_by": user_id,
+                "name": item.project_name,
+            }
+            for item in items
+        ],
+    ).scalars().all()
+
+    versions = db.execute(
+        insert(ProjectVersion).returning(ProjectVersion.id, sort_by_parameter_order=True),
+        [
+            {
+                "project_id": project_id,
+                "version_number": 1,
+                "status": ProjectStatus.draft.value,
+                "project_name": item.project_name,
+                "project_start_date": item.project_start_date,
+                "project_end_date": item.project_end_date,
+                "business_unit": item.business_unit,
+                "reviewer_id": item.reviewer_id,
+                "creator_id": user_id,
+                "is_active": False,
+            }
+            for project_id, item in zip(projects, items)
+        ],
+    ).scalars().all()
+
+    insert_rows(
+        db,
+        JobCategory,
+        [
+            {
+                "project_version_id": version_id,
+                "name": category.name,
+                "rate_card_id": category.rate_card_id,
+            }
+            for version_id, item in zip(versions, items)
+            for category in item.job_categories
+        ],
+    )
+    return projects
+
+
+def import_projects(db: Session, stream: BinaryIO, user_id: int) -> ImportReport:
+    """
+    NDJSON of ProjectImportIn, one project per line. Each batch is checked
+    up front and inserted set-wise inside a savepoint; if the database still
+    rejects it (e.g. a project_code taken concurrently) the batch is retried
+    row by row so only the offending rows fail. Commits per batch.
+    """
+    report = ImportReport()
+
+    for batch in read_ndjson_batches(stream, report):
+        valid = _check_projects(db, batch, report)
+        created = []
+        if valid:
+            try:
+                with db.begin_nested():
+                    created = _insert_projects(db, [item for _, item in valid], user_id)
+            except (IntegrityError, DataError):
+                for line, item in valid:
+                    try:
+                        with db.begin_nested():
+                            created += _insert_projects(db, [item], user_id)
+                    except (IntegrityError, DataError) as exc:
+                        report.add_error(line, [f"Rejected by the database: {exc.orig}"])
+
+        record_audit_many(
+            db,
+            entity="project",
+            action="create",
+            user_id=user_id,
+            entries=[(str(project_id), {"version": 1, "import": True}) for project_id in created],
+        )
+        db.commit()
+        report.imported += len(created)
+
+    return report
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job_category import RateCard
+from app.schemas.job_category import RateCardOut
+
+
+@dataclass(frozen=True)
+class RateCardSnapshot:
+    cards: dict[int, RateCardOut]
+    body: bytes
+    etag: str
+    loaded_at: float
+
+
+class RateCardCache:
+    """
+    Per-process cache of the (small) rate_cards table. Entries live for
+    ttl_seconds; invalidate() drops them immediately, e.g. after a write. Other
+    workers pick up changes when their own TTL runs out.
+
+    Ids missing from the snapshot (e.g. created in another worker) are looked up
+    on their own and kept until the next reload; ids still absent are remembered
+    as missing for ttl_seconds, so unknown ids cost one query per TTL.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._snapshot: RateCardSnapshot | None = None
+        self._extra: dict[int, RateCardOut] = {}
+        self._missing: dict[int, float] = {}
+
+    def snapshot(self, db: Session) -> RateCardSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl_seconds:
+            return snapshot
+        return self._reload(db, stale=snapshot)
+
+    def get(self, db: Session, rate_card_id: int) -> RateCardOut | None:
+        return self.get_many(db, [rate_card_id]).get(rate_card_id)
+
+    def get_many(self, db: Session, rate_card_ids) -> dict[int, RateCardOut]:
+        snapshot = self.snapshot(db)
+        found, unknown = {}, set()
+        now = time.monotonic()
+        for rate_card_id in rate_card_ids:
+            card = snapshot.cards.get(rate_card_id) or self._extra.get(rate_card_id)
+            if card is not None:
+                found[rate_card_id] = card
+            elif now - self._missing.get(rate_card_id, float('-inf')) >= self.ttl_seconds:
+                unknown.add(rate_card_id)
+        if unknown:
+            # a card created in another worker may not be cached here yet
+            found.update(self._fetch(db, unknown))
+        return found
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._extra = {}
+            self._missing = {}
+
+    def _fetch(self, db: Session, rate_card_ids: set[int]) -> dict[int, RateCardOut]:
+        rows = db.scalars(select(RateCard).where(RateCard.id.in_(rate_card_ids))).all()
+        cards = {row.id: RateCardOut.model_validate(row) for row in rows}
+        checked_at = time.monotonic()
+        with self._lock:
+            self._extra.update(cards)
+            for rate_card_id in rate_card_ids - cards.keys():
+                self._missing[rate_card_id] = checked_at
+            for rate_card_id in cards:
+                self._missing.pop(rate_card_id, None)
+        return cards
+
+    def _reload(self, db: Session, stale: RateCardSnapshot | None) -> RateCardSnapshot:
+        with self._lock:
+            # another thread may have reloaded while we waited for the lock
+            if self._snapshot is not stale and self._snapshot is not None:
+                return self._snapshot
+
+            rows = db.scalars(select(RateCard).order_by(RateCard.id)).all()
+            cards = {row.id: RateCardOut.model_validate(row) for row in rows}
+            body = json.dumps([card.model_dump() for card in cards.values()]).encode()
+            snapshot = RateCardSnapshot(
+                cards=cards,
+                body=body,
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                loaded_at=time.monotonic(),
+            )
+            self._snapshot = snapshot
+            # the snapshot now holds every card fetched on its own since the last reload
+            self._extra = {}
+            self._missing = {
+                rate_card_id: checked_at
+                for rate_card_id, checked_at in self._missing.items()
+                if rate_card_id not in cards and snapshot.loaded_at - checked_at < self.ttl_seconds
+            }
+            return snapshot
+
+
+rate_card_cache = RateCardCache(ttl_seconds=settings.RATE_CARD_CACHE_TTL_SECONDS)
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+
+from sqlalchemy import Integer, Select, case, cast, func, or_, select
+
+from app.api.pagination import PageParams, build_page
+from app.models.client import Client
+from app.models.project import Project
+
+# match tiers; trigram similarity (0-1000) is added on top on Postgres, so a
+# prefix hit always outranks a substring hit, which outranks a fuzzy one
+PREFIX_SCORE = 3000
+SUBSTRING_SCORE = 2000
+SIMILAR_SCORE = 1000
+
+CLIENT_SEARCH_COLUMNS = (
+    Client.legal_entity_name,
+    Client.gst_number,
+    Client.primary_contact_email,
+)
+PROJECT_SEARCH_COLUMNS = (Project.project_code, Project.name)
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    statement: Select
+    # keyset: (score desc, id desc)
+    keys: tuple
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+def ranked_search(model, columns, term: str, dialect: str) -> SearchQuery:
+    """
+    Prefix / substring / trigram search over columns. On Postgres ILIKE and
+    the % operator are both served by the gin_trgm_ops indexes; other
+    databases (SQLite in tests) fall back to LIKE without similarity.
+    """
+    term = term.strip()
+    escaped = _escape_like(term)
+    # ILIKE on the bare column, so Postgres can use the trigram index
+    prefix = [column.ilike(f"{escaped}%", escape="/") for column in columns]
+    substring = [column.ilike(f"%{escaped}%", escape="/") for column in columns]
+
+    tier = case(
+        (or_(*prefix), PREFIX_SCORE),
+        (or_(*substring), SUBSTRING_SCORE),
+        else_=SIMILAR_SCORE,
+    )
+
+    if dialect == "postgresql":
+        similar = [column.op("%")(term) for column in columns]
+        similarity = func.greatest(*[func.similarity(column, term) for column in columns])
+        score = tier + cast(similarity * 1000, Integer)
+        match = or_(*substring, *similar)
+    else:
+        score = tier
+        match = or_(*substring)
+
+    ranked = (
+        select(model.id.label("id"), score.label("score"))
+        .where(match)
+        .subquery("ranked")
+    )
+    statement = (
+        select(model, ranked.c.score, ranked.c.id)
+        .join(ranked, ranked.c.id == model.id)
+    )
+    return SearchQuery(statement=statement, keys=(ranked.c.score, ranked.c.id))
+
+
+def search_clients(term: str, dialect: str) -> SearchQuery:
+    return ranked_search(Client, CLIENT_SEARCH_COLUMNS, term, dialect)
+
+
+def search_projects(term: str, dialect: str) -> SearchQuery:
+    return ranked_search(Project, PROJECT_SEARCH_COLUMNS, term, dialect)
+
+
+def build_search_page(rows, page: PageParams, search: SearchQuery) -> dict:
+    result = build_page(rows, page, *search.keys)
+    # rows are (entity, score, id); the response only carries the entity
+    result["items"] = [row[0] for row in result["items"]]
+    return result
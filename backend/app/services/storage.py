@@ -1,13 +1,57 @@
+import hashlib
+import os
+from dataclasses import dataclass
 from pathlib import Path
-import boto3
+from typing import BinaryIO
 from app.core.config import settings
 
 _LOCAL_DIR = Path('uploads')
+_CHUNK_SIZE = 1024 * 1024
+# S3 rejects multipart parts under 5 MiB (except the last one)
+_S3_PART_SIZE = 8 * 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+@dataclass
+class StoredObject:
+    location: str
+    size: int
+    sha256: str
+
+
+class _Reader:
+    """Reads fixed-size chunks, enforcing max_bytes and hashing as it goes."""
+
+    def __init__(self, stream: BinaryIO, max_bytes: int | None):
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int) -> bytes:
+        chunk = self.stream.read(size)
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise UploadTooLarge(f'upload exceeds {self.max_bytes} bytes')
+        self.digest.update(chunk)
+        return chunk
+
 
 class StorageService:
     def __init__(self):
         self.mode = settings.STORAGE_MODE.lower()
-        self.s3 = boto3.client('s3', region_name=settings.AWS_REGION) if self.mode == 's3' else None
+        self._s3 = None
+
+    @property
+    def s3(self):
+        # boto3 is slow to import; only pay for it in s3 mode, on first use
+        if self._s3 is None:
+            import boto3
+            self._s3 = boto3.client('s3', region_name=settings.AWS_REGION)
+        return self._s3
 
     def save(self, key: str, data: bytes) -> str:
         if self.mode == 's3':
@@ -19,4 +63,64 @@ class StorageService:
         path.write_bytes(data)
         return str(path)
 
+    def save_stream(self, key: str, stream: BinaryIO, max_bytes: int | None = None) -> StoredObject:
+        """
+        Copies stream to storage without buffering it whole; the size limit and
+        the sha256 are both handled in the same pass. Raises UploadTooLarge and
+        leaves nothing behind when max_bytes is exceeded.
+        """
+        reader = _Reader(stream, max_bytes)
+        if self.mode == 's3':
+            location = self._save_stream_s3(key, reader)
+        else:
+            location = self._save_stream_local(key, reader)
+        return StoredObject(location=location, size=reader.size, sha256=reader.digest.hexdigest())
+
+    def _save_stream_local(self, key: str, reader: _Reader) -> str:
+        path = _LOCAL_DIR / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + '.part')
+        try:
+            with partial.open('wb') as out:
+                while chunk := reader.read(_CHUNK_SIZE):
+                    out.write(chunk)
+            os.replace(partial, path)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        return str(path)
+
+    def _save_stream_s3(self, key: str, reader: _Reader) -> str:
+        first = reader.read(_S3_PART_SIZE)
+        if len(first) < _S3_PART_SIZE:
+            # fits in one part: a plain PUT is a single round trip
+            self.s3.put_object(Bucket=settings.S3_BUCKET, Key=key, Body=first)
+            return key
+
+        upload = self.s3.create_multipart_upload(Bucket=settings.S3_BUCKET, Key=key)
+        upload_id = upload['UploadId']
+        parts = []
+        try:
+            chunk = first
+            while chunk:
+                part = self.s3.upload_part(
+                    Bucket=settings.S3_BUCKET,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=len(parts) + 1,
+                    Body=chunk,
+                )
+                parts.append({'ETag': part['ETag'], 'PartNumber': len(parts) + 1})
+                chunk = reader.read(_S3_PART_SIZE)
+            self.s3.complete_multipart_upload(
+                Bucket=settings.S3_BUCKET,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts},
+            )
+        except BaseException:
+            self.s3.abort_multipart_upload(Bucket=settings.S3_BUCKET, Key=key, UploadId=upload_id)
+            raise
+        return key
+
 storage = StorageService()
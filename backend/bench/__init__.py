@@ -0,0 +1,24 @@
+"""
+Benchmarks and load tooling. Each module is a CLI run from backend/:
+
+    python -m bench.endpoints --help
+    python -m bench.generate_data --help
+    python -m bench.loadgen --help
+"""
+import os
+import tempfile
+from pathlib import Path
+
+
+def scratch_environment(database_url: str | None = None) -> Path:
+    """
+    Points the app at database_url (a temporary SQLite file by default) with
+    local contract storage in a scratch directory, which becomes the working
+    directory. Settings are read at import time, so call this before importing app.
+    """
+    workdir = Path(tempfile.mkdtemp(prefix='crm-bench-'))
+    os.environ['DATABASE_URL'] = database_url or f'sqlite:///{workdir / "bench.db"}'
+    os.environ.pop('ASYNC_DATABASE_URL', None)
+    os.environ['STORAGE_MODE'] = 'local'
+    os.chdir(workdir)
+    return workdir
@@ -0,0 +1,223 @@
+"""
+In-process endpoint benchmark. Loads bench.generate_data into a throwaway
+SQLite file (or a scratch Postgres via --database-url --reset), drives the ASGI
+app through TestClient and reports latency percentiles and SQL statements per
+request for each route. Requests a route needs (drafts to submit, pending
+versions to approve) are set up before its timed loop.
+
+    python -m bench.endpoints --scale 0.01 --requests 300
+    python -m bench.endpoints --save-baseline bench/baseline.json
+    python -m bench.endpoints --baseline bench/baseline.json   # exit 1 on regression
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from bench import scratch_environment
+
+# incompressible like a real PDF; long runs of boundary characters send
+# python-multipart down a byte-at-a-time path and dwarf everything else
+CONTRACT_BYTES = b'%PDF-1.4\n' + random.Random(0).randbytes(64 * 1024)
+
+ROUTES = (
+    'create_project',
+    'list_projects',
+    'list_pending',
+    'submit',
+    'approve',
+    'upload_contract',
+    'audit',
+)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='defaults to a temporary SQLite file')
+    parser.add_argument('--reset', action='store_true',
+                        help='drop and recreate every table in --database-url first (required for it)')
+    parser.add_argument('--scale', type=float, default=0.002,
+                        help='fraction of the generate_data full-scale volumes (0.002: 2k versions, 100k audit rows)')
+    parser.add_argument('--requests', type=int, default=200, help='timed requests per route')
+    parser.add_argument('--warmup', type=int, default=10, help='untimed requests per route')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--routes', default=','.join(ROUTES), help='comma separated subset of: ' + ', '.join(ROUTES))
+    parser.add_argument('--save-baseline', type=Path, metavar='PATH')
+    parser.add_argument('--baseline', type=Path, metavar='PATH', help='compare against a saved report')
+    parser.add_argument('--metric', choices=('p50', 'p95', 'p99'), default='p50',
+                        help='latency compared against the baseline; tails are noisy on shared machines')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown vs baseline')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5, help='ignore changes smaller than this')
+    args = parser.parse_args(argv)
+
+    if args.database_url and not args.reset:
+        parser.error('--database-url wipes that database; pass --reset to confirm')
+    unknown = set(args.routes.split(',')) - set(ROUTES)
+    if unknown:
+        parser.error(f'unknown routes: {", ".join(sorted(unknown))}')
+    return args
+
+
+@dataclass(frozen=True)
+class Actors:
+    creator: dict
+    approver: dict
+    approver_id: int
+
+
+def _project_payload(code: str, actors: Actors) -> dict:
+    return {
+        'project_code': code,
+        'project_name': f'Bench {code}',
+        'project_start_date': '2024-01-01',
+        'project_end_date': '2024-12-31',
+        'business_unit': 'bench',
+        'reviewer_id': actors.approver_id,
+        'client_id': 1,
+    }
+
+
+def _new_draft(client, code: str, actors: Actors, with_contract: bool = True) -> tuple[int, int]:
+    """A fresh project whose version 1 draft is ready to submit."""
+    project = client.post('/api/v1/projects', headers=actors.creator, json=_project_payload(code, actors)).json()
+    version_id = client.get(f'/api/v1/projects/{project["id"]}/versions').json()['items'][-1]['id']
+    client.post(
+        f'/api/v1/projects/{project["id"]}/versions/{version_id}/job-categories',
+        headers=actors.creator,
+        json=[{'name': 'engineer', 'rate_card_id': 1}],
+    )
+    if with_contract:
+        _upload(client, project['id'], version_id, actors)
+    return project['id'], version_id
+
+
+def _upload_request(project_id: int, version_id: int, actors: Actors) -> tuple:
+    return ('POST', f'/api/v1/projects/{project_id}/versions/{version_id}/contracts', {
+        'headers': actors.creator,
+        'data': {'document_type': 'msa', 'valid_from': '2024-01-01', 'valid_till': '2025-01-01'},
+        'files': {'file': ('contract.pdf', CONTRACT_BYTES, 'application/pdf')},
+    })
+
+
+def _upload(client, project_id: int, version_id: int, actors: Actors):
+    method, url, kwargs = _upload_request(project_id, version_id, actors)
+    return client.request(method, url, **kwargs)
+
+
+def prepare(
+    route: str,
+    client,
+    count: int,
+    rng: random.Random,
+    actors: Actors,
+    seeded_versions: int,
+) -> list[tuple]:
+    """(method, url, kwargs) for `count` requests of a route; setup calls are not timed."""
+    tag = f'{route}-{time.monotonic_ns()}'
+    if route == 'create_project':
+        return [
+            ('POST', '/api/v1/projects', {'headers': actors.creator, 'json': _project_payload(f'{tag}-{i}', actors)})
+            for i in range(count)
+        ]
+    if route == 'list_projects':
+        return [('GET', '/api/v1/projects?limit=50', {})] * count
+    if route == 'list_pending':
+        return [('GET', '/api/v1/approvals/pending?all_reviewers=true&limit=50', {'headers': actors.approver})] * count
+    if route == 'submit':
+        drafts = [_new_draft(client, f'{tag}-{i}', actors) for i in range(count)]
+        return [('POST', f'/api/v1/projects/{project_id}/submit', {'headers': actors.creator}) for project_id, _ in drafts]
+    if route == 'approve':
+        requests = []
+        for i in range(count):
+            project_id, version_id = _new_draft(client, f'{tag}-{i}', actors)
+            client.post(f'/api/v1/projects/{project_id}/submit', headers=actors.creator)
+            requests.append(('POST', f'/api/v1/approvals/{version_id}/approve', {'headers': actors.approver, 'json': {}}))
+        return requests
+    if route == 'upload_contract':
+        drafts = [_new_draft(client, f'{tag}-{i}', actors, with_contract=False) for i in range(count)]
+        return [_upload_request(project_id, version_id, actors) for project_id, version_id in drafts]
+    if route == 'audit':
+        return [
+            ('GET', f'/api/v1/audit?entity_type=project_version&entity_id={rng.randint(1, seeded_versions)}', {})
+            for _ in range(count)
+        ]
+    raise ValueError(route)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    baseline = args.baseline.resolve() if args.baseline else None
+    save_baseline = args.save_baseline.resolve() if args.save_baseline else None
+    scratch_environment(args.database_url)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.db.session import get_async_engine, get_engine
+    from app.main import app
+    from bench.generate_data import Volumes, generate, prepare_schema
+    from bench.stats import compare, format_table, save_report, summarize
+
+    engine = get_engine()
+    prepare_schema(engine, reset=True)
+    generated = generate(engine, Volumes.scaled(args.scale, users=50, rate_cards=10), seed=args.seed)
+    volumes = generated.volumes
+    print(f'loaded {sum(generated.rows.values()):,} rows ({volumes.versions:,} versions) '
+          f'on {engine.dialect.name} in {generated.seconds:.1f}s')
+
+    approver_id = volumes.approvers.start
+    actors = Actors(
+        creator={'X-User-Id': str(volumes.creators.start), 'X-Role': 'creator'},
+        approver={'X-User-Id': str(approver_id), 'X-Role': 'approver'},
+        approver_id=approver_id,
+    )
+
+    counter = {'statements': 0}
+
+    def count(*_args):
+        counter['statements'] += 1
+
+    for bound in (engine, get_async_engine().sync_engine):
+        event.listen(bound, 'before_cursor_execute', count)
+
+    rng = random.Random(args.seed)
+    results = {}
+    with TestClient(app) as client:
+        for route in args.routes.split(','):
+            requests = prepare(route, client, args.warmup + args.requests, rng, actors, volumes.versions)
+            for method, url, kwargs in requests[:args.warmup]:
+                client.request(method, url, **kwargs)
+            gc.collect()
+
+            latencies, queries, errors = [], [], 0
+            for method, url, kwargs in requests[args.warmup:]:
+                counter['statements'] = 0
+                start = time.perf_counter()
+                response = client.request(method, url, **kwargs)
+                latencies.append(time.perf_counter() - start)
+                queries.append(counter['statements'])
+                errors += response.status_code >= 400
+            results[route] = summarize(latencies, errors, queries)
+
+    metric = f'{args.metric}_ms'
+    print(format_table(results, baseline, metric))
+
+    if save_baseline:
+        meta = {'database': engine.dialect.name, 'scale': args.scale, 'requests': args.requests}
+        save_report(save_baseline, meta, results)
+        print(f'saved {save_baseline}')
+
+    if baseline:
+        regressions = compare(results, baseline, metric, args.tolerance, args.min_delta_ms)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
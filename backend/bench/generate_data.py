@@ -0,0 +1,353 @@
+"""
+Deterministic synthetic data for every CRM table. The same volumes and --seed
+always produce the same rows. Versions per project follow a heavy-tailed
+(Pareto) distribution; the latest version of a project can be in any state,
+earlier ones were approved or rejected. Decided versions get an approval
+event; audit rows (create, update, submit, decision, ...) are spread evenly
+over the versions to reach --audit-rows.
+
+Rows are generated project by project into per-table buffers that are
+flushed in foreign key order: COPY on Postgres, executemany elsewhere.
+Secondary indexes are dropped during the load and rebuilt at the end.
+
+    python -m bench.generate_data --database-url postgresql+psycopg2://... --reset --scale 1
+    python -m bench.generate_data --database-url sqlite:///crm.db --reset --scale 0.01
+
+--scale 1 is 100k clients, 1M project versions and 50M audit rows.
+"""
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Engine, create_engine, func, select, text, update
+
+import app.models as models
+from app.db.base import Base
+from app.db.bulk import copy_values
+
+FULL_SCALE = {'clients': 100_000, 'versions': 1_000_000, 'audit_rows': 50_000_000}
+
+EPOCH = datetime(2023, 1, 1)
+SPAN = timedelta(days=730)
+
+# status of a project's latest version; earlier versions are decided
+LATEST_STATUS = (('draft', 0.15), ('pending', 0.10), ('approved', 0.60), ('rejected', 0.15))
+EARLIER_REJECTED = 0.15
+# versions per project: Pareto(alpha) truncated at MAX_VERSIONS, mean ~3.5
+VERSIONS_ALPHA = 1.2
+MAX_VERSIONS = 200
+
+_WORDS = ('Apex', 'Blue', 'Cedar', 'Delta', 'Ember', 'Falcon', 'Granite', 'Harbor', 'Iris', 'Juniper',
+          'Keystone', 'Lumen', 'Maple', 'Nova', 'Orion', 'Pioneer', 'Quartz', 'River', 'Summit', 'Tidal')
+_KINDS = ('Analytics', 'Consulting', 'Foods', 'Health', 'Logistics', 'Media', 'Retail', 'Systems', 'Textiles', 'Works')
+_SUFFIXES = ('Ltd', 'Pvt Ltd', 'LLP', 'Inc', 'GmbH')
+_PROJECTS = ('Migration', 'Rollout', 'Audit', 'Platform', 'Support', 'Redesign', 'Integration', 'Onboarding')
+_UNITS = ('consulting', 'delivery', 'support', 'engineering', 'finance')
+_ROLES = ('Engineer', 'Senior Engineer', 'Analyst', 'Architect', 'Project Manager', 'QA', 'Designer')
+
+# column order of the tuples each table is fed; FK order for flushing
+COLUMNS = {
+    'users': ('id', 'name', 'role'),
+    'rate_cards': ('id', 'name', 'rate_per_hour', 'currency'),
+    'clients': (
+        'id', 'legal_entity_name', 'registered_address', 'billing_address', 'billing_same_as_registered',
+        'mode_of_payment', 'gst_number', 'billing_currency', 'primary_contact_name',
+        'primary_contact_designation', 'primary_contact_phone', 'primary_contact_email', 'updated_at',
+    ),
+    'projects': ('id', 'project_code', 'client_id', 'created_by', 'name', 'active_version_id', 'updated_at'),
+    'project_versions': (
+        'id', 'project_id', 'version_number', 'status', 'project_name', 'project_start_date',
+        'project_end_date', 'business_unit', 'reviewer_id', 'creator_id', 'submitted_at', 'approved_at',
+        'rejected_at', 'rejection_comment', 'is_active', 'claimed_by', 'claim_expires_at', 'updated_at',
+    ),
+    'contract_documents': (
+        'id', 'project_version_id', 'document_type', 'valid_from', 'valid_till', 's3_key', 'filename',
+        'size_bytes', 'checksum_sha256', 'uploaded_at',
+    ),
+    'job_categories': ('id', 'project_version_id', 'name', 'rate_card_id'),
+    'approval_events': ('id', 'project_version_id', 'action', 'actor_id', 'comment', 'created_at'),
+    'audit_logs': ('id', 'entity_type', 'entity_id', 'action', 'actor_id', 'data', 'created_at'),
+}
+
+
+@dataclass(frozen=True)
+class Volumes:
+    clients: int
+    versions: int
+    audit_rows: int
+    users: int = 500
+    rate_cards: int = 50
+
+    @classmethod
+    def scaled(cls, scale: float, **overrides) -> 'Volumes':
+        counts = {name: max(1, int(value * scale)) for name, value in FULL_SCALE.items()}
+        counts.update({name: value for name, value in overrides.items() if value is not None})
+        return cls(**counts)
+
+    @property
+    def creators(self) -> range:
+        # the first 80% of users are creators, the rest approvers
+        return range(1, max(1, self.users * 4 // 5) + 1)
+
+    @property
+    def approvers(self) -> range:
+        return range(self.creators.stop, max(self.creators.stop + 1, self.users + 1))
+
+
+@dataclass(frozen=True)
+class Generated:
+    volumes: Volumes
+    rows: dict[str, int]
+    seconds: float
+
+
+class _Loader:
+    """Per-table buffers, flushed together in COLUMNS (foreign key) order."""
+
+    def __init__(self, connection, batch_size: int):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.postgres = connection.dialect.name == 'postgresql'
+        self.buffers = {table: [] for table in COLUMNS}
+        self.pending = 0
+        self.written = dict.fromkeys(COLUMNS, 0)
+
+    def add(self, table: str, row: tuple) -> None:
+        self.buffers[table].append(row)
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for table, rows in self.buffers.items():
+            if rows:
+                self._write(table, rows)
+                self.written[table] += len(rows)
+                rows.clear()
+        self.pending = 0
+        self.connection.commit()
+
+    def _write(self, table: str, rows: list[tuple]) -> None:
+        columns = COLUMNS[table]
+        if not self.postgres:
+            self.connection.execute(
+                Base.metadata.tables[table].insert(),
+                [dict(zip(columns, row)) for row in rows],
+            )
+            return
+        copy_values(self.connection, table, columns, rows)
+
+
+def _pick(rng: random.Random, weighted) -> str:
+    roll = rng.random()
+    for value, weight in weighted:
+        roll -= weight
+        if roll < 0:
+            return value
+    return weighted[-1][0]
+
+
+def _version_actions(status: str, contracts: int, categories: int) -> list[str]:
+    actions = ['create'] + ['upload'] * contracts + (['add'] if categories else [])
+    if status != 'draft':
+        actions.append('submit')
+    if status in ('approved', 'rejected'):
+        actions.append('approve' if status == 'approved' else 'reject')
+    return actions
+
+
+def _reset_sequences(connection) -> None:
+    # rows were inserted with explicit ids; move the identity sequences past them
+    if connection.dialect.name != 'postgresql':
+        return
+    for table in COLUMNS:
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"coalesce((SELECT max(id) FROM {table}), 0) + 1, false)"
+        ))
+
+
+def generate(engine: Engine, volumes: Volumes, seed: int = 0, batch_size: int = 100_000) -> Generated:
+    """Loads `volumes` into empty tables on `engine`."""
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    creators, approvers = volumes.creators, volumes.approvers
+    audit_per_version, audit_extra = divmod(volumes.audit_rows, volumes.versions)
+
+    indexes = [index for table in Base.metadata.tables.values() for index in table.indexes]
+    with engine.connect() as connection:
+        for index in indexes:
+            index.drop(connection, checkfirst=True)
+        connection.commit()
+
+        loader = _Loader(connection, batch_size)
+        for user_id in creators:
+            loader.add('users', (user_id, f'Creator {user_id}', 'creator'))
+        for user_id in approvers:
+            loader.add('users', (user_id, f'Approver {user_id}', 'approver'))
+        for card_id in range(1, volumes.rate_cards + 1):
+            loader.add('rate_cards', (card_id, f'{rng.choice(_ROLES)} grade {card_id}',
+                                      str(rng.randrange(20, 250)), rng.choice(('USD', 'INR', 'EUR'))))
+
+        for client_id in range(1, volumes.clients + 1):
+            word, kind = rng.choice(_WORDS), rng.choice(_KINDS)
+            slug = f'{word}{kind}{client_id}'.lower()
+            separate_billing = rng.random() < 0.2
+            loader.add('clients', (
+                client_id,
+                f'{word} {kind} {client_id} {rng.choice(_SUFFIXES)}',
+                f'{rng.randrange(1, 999)} {rng.choice(_WORDS)} Road',
+                f'{rng.randrange(1, 999)} {rng.choice(_WORDS)} Avenue' if separate_billing else None,
+                not separate_billing,
+                rng.choice(('wire', 'cheque', 'card')),
+                f'{rng.randrange(10, 37)}ABCDE{client_id:07d}Z{rng.randrange(10)}',
+                rng.choice(('INR', 'USD', 'EUR')),
+                f'Contact {client_id}',
+                rng.choice((None, 'Director', 'Manager', 'Procurement')),
+                f'+91{rng.randrange(10**9, 10**10)}',
+                f'contact@{slug}.example.com',
+                EPOCH,
+            ))
+
+        version_id = contract_id = category_id = event_id = audit_id = 0
+        project_id = 0
+        seconds_per_version = SPAN.total_seconds() / volumes.versions
+        while version_id < volumes.versions:
+            project_id += 1
+            count = min(int(rng.paretovariate(VERSIONS_ALPHA)), MAX_VERSIONS, volumes.versions - version_id)
+            creator = rng.choice(creators)
+            name = f'{rng.choice(_WORDS)} {rng.choice(_PROJECTS)} {project_id}'
+            created = EPOCH + timedelta(seconds=int(version_id * seconds_per_version))
+            start = created.date().replace(day=1)
+            loader.add('projects', (
+                project_id, f'PRJ-{project_id:08d}', rng.randint(1, volumes.clients), creator,
+                name, None, created,
+            ))
+
+            statuses = ['rejected' if rng.random() < EARLIER_REJECTED else 'approved' for _ in range(count - 1)]
+            statuses.append(_pick(rng, LATEST_STATUS))
+            # the latest approved version is the active one
+            active = max((n for n, status in enumerate(statuses, start=1) if status == 'approved'), default=None)
+
+            for number, status in enumerate(statuses, start=1):
+                version_id += 1
+                opened = created + timedelta(days=(number - 1) * rng.randint(7, 45))
+                submitted = opened + timedelta(hours=rng.randint(1, 96)) if status != 'draft' else None
+                decided = submitted + timedelta(hours=rng.randint(1, 72)) if status in ('approved', 'rejected') else None
+                reviewer = rng.choice(approvers)
+                loader.add('project_versions', (
+                    version_id, project_id, number, status, name, start,
+                    date(start.year + 1, start.month, 1) - timedelta(days=1), rng.choice(_UNITS),
+                    reviewer, creator, submitted,
+                    decided if status == 'approved' else None,
+                    decided if status == 'rejected' else None,
+                    'Rates need revisiting' if status == 'rejected' else None,
+                    number == active, None, None, decided or submitted or opened,
+                ))
+
+                contracts = rng.randint(1, 3) if status != 'draft' else rng.randint(0, 2)
+                for i in range(contracts):
+                    contract_id += 1
+                    loader.add('contract_documents', (
+                        contract_id, version_id, rng.choice(('msa', 'sow', 'nda')), start,
+                        date(start.year + rng.randint(1, 3), start.month, 1),
+                        f'contracts/{project_id}/{version_id}/{contract_id}.pdf', f'contract-{i + 1}.pdf',
+                        rng.randint(20_000, 5_000_000), None, opened,
+                    ))
+                categories = rng.randint(1, 5) if status != 'draft' else rng.randint(0, 3)
+                for _ in range(categories):
+                    category_id += 1
+                    loader.add('job_categories', (
+                        category_id, version_id, rng.choice(_ROLES), rng.randint(1, volumes.rate_cards),
+                    ))
+                if decided:
+                    event_id += 1
+                    loader.add('approval_events', (
+                        event_id, version_id, status, reviewer,
+                        'Rates need revisiting' if status == 'rejected' else None, decided,
+                    ))
+
+                # pad the natural history with draft edits, or cut it short,
+                # so the audit total lands exactly on volumes.audit_rows
+                wanted = audit_per_version + (version_id <= audit_extra)
+                actions = _version_actions(status, contracts, categories)
+                actions = (actions[:-1] + ['update'] * (wanted - len(actions)) + actions[-1:])[:wanted]
+                for step, action in enumerate(actions):
+                    audit_id += 1
+                    actor = reviewer if action in ('approve', 'reject') else creator
+                    at = decided if action in ('approve', 'reject') else opened + timedelta(minutes=step)
+                    loader.add('audit_logs', (audit_id, 'project_version', str(version_id), action, actor, None, at))
+
+        loader.flush()
+
+        # projects went in before their versions, so point them at the active one now
+        connection.execute(
+            update(models.Project)
+            .where(models.ProjectVersion.project_id == models.Project.id)
+            .where(models.ProjectVersion.is_active.is_(True))
+            # keep the generated updated_at rather than the column's onupdate
+            .values(active_version_id=models.ProjectVersion.id, updated_at=models.Project.updated_at)
+        )
+        _reset_sequences(connection)
+        connection.commit()
+
+        for index in indexes:
+            index.create(connection)
+        connection.commit()
+        connection.execute(text('ANALYZE'))
+        connection.commit()
+
+    return Generated(volumes=volumes, rows=loader.written, seconds=time.perf_counter() - started)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--reset', action='store_true', help='drop and recreate every table first')
+    parser.add_argument('--scale', type=float, default=0.01, help='fraction of the full-scale volumes')
+    parser.add_argument('--clients', type=int)
+    parser.add_argument('--versions', type=int)
+    parser.add_argument('--audit-rows', type=int)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--rate-cards', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=100_000, help='rows buffered across tables per flush')
+    args = parser.parse_args(argv)
+
+    volumes = Volumes.scaled(
+        args.scale,
+        clients=args.clients,
+        versions=args.versions,
+        audit_rows=args.audit_rows,
+        users=args.users,
+        rate_cards=args.rate_cards,
+    )
+    engine = create_engine(args.database_url)
+    prepare_schema(engine, reset=args.reset)
+
+    generated = generate(engine, volumes, seed=args.seed, batch_size=args.batch_size)
+    for table, count in generated.rows.items():
+        print(f'{table:<20}{count:>14,}')
+    total = sum(generated.rows.values())
+    print(f'{total:,} rows in {generated.seconds:.1f}s ({total / generated.seconds:,.0f} rows/s)')
+    return 0
+
+
+def prepare_schema(engine: Engine, reset: bool) -> None:
+    """Creates the tables; with reset, drops them first. Refuses to load into non-empty tables."""
+    if reset:
+        with engine.begin() as connection:
+            for table in Base.metadata.tables:
+                cascade = ' CASCADE' if engine.dialect.name == 'postgresql' else ''
+                connection.execute(text(f'DROP TABLE IF EXISTS {table}{cascade}'))
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        if connection.scalar(select(func.count()).select_from(models.User)):
+            raise SystemExit('tables already hold data; pass --reset to replace them')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
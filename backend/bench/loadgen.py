@@ -0,0 +1,335 @@
+"""
+Workflow load generator. Concurrent creators and approvers run the real
+approval cycle against the ASGI app in process (on data from
+bench.generate_data) or against a running server with --base-url:
+
+    creator:  create project -> add job categories -> upload contract -> submit
+              -> wait for the decision -> (approved, --revise) new version -> ...
+    approver: list pending (or claim) -> approve / reject each
+
+Creators start workflows as a Poisson process, --rate per second across all of
+them. Reports throughput, per-step latency percentiles, errors and contention
+(409s and decisions that lost the race to another approver).
+
+    python -m bench.loadgen --creators 20 --approvers 4 --rate 5 --duration 30
+    python -m bench.loadgen --queue claim --database-url postgresql+psycopg2://... --reset
+    python -m bench.loadgen --base-url http://localhost:8000 --users 500
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict
+from pathlib import Path
+
+import httpx
+
+from bench import scratch_environment
+from bench.stats import summarize
+
+API = '/api/v1'
+CONTRACT_BYTES = b'%PDF-1.4\n' + random.Random(1).randbytes(64 * 1024)
+
+
+class Recorder:
+    """Per-step latencies and outcomes. A conflict is a request that lost a race, not a failure."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.conflicts = defaultdict(int)
+        self.statuses = defaultdict(int)
+        self.counters = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, step: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.latencies[step].append(time.perf_counter() - start)
+            self.errors[step] += 1
+            self.statuses[type(exc).__name__] += 1
+            return None
+        self.latencies[step].append(time.perf_counter() - start)
+        self.statuses[str(response.status_code)] += 1
+        if response.status_code == 409 or (
+            step in ('approve', 'reject') and response.status_code == 400
+            and 'not pending' in response.text
+        ):
+            self.conflicts[step] += 1
+            return None
+        if response.status_code >= 400:
+            self.errors[step] += 1
+            return None
+        return response
+
+
+class Workload:
+    def __init__(self, client: httpx.AsyncClient, args, creator_ids: list[int], approver_ids: list[int]):
+        self.client = client
+        self.args = args
+        self.creator_ids = creator_ids
+        self.approver_ids = approver_ids
+        self.recorder = Recorder()
+        self.rng = random.Random(args.seed)
+        self.deadline = 0.0
+
+    def running(self) -> bool:
+        return time.monotonic() < self.deadline
+
+    async def creator(self, user_id: int) -> None:
+        headers = {'X-User-Id': str(user_id), 'X-Role': 'creator'}
+        per_creator_rate = self.args.rate / len(self.creator_ids)
+        sequence = 0
+        while True:
+            delay = self.rng.expovariate(per_creator_rate)
+            await asyncio.sleep(min(delay, max(0.0, self.deadline - time.monotonic())))
+            if not self.running():
+                return
+            sequence += 1
+            self.recorder.counters['workflows_started'] += 1
+            if await self.workflow(headers, f'LG-{user_id}-{sequence}-{self.args.seed}'):
+                self.recorder.counters['workflows_completed'] += 1
+
+    async def workflow(self, headers: dict, code: str) -> bool:
+        call = self.recorder.call
+        response = await call(self.client, 'create_project', 'POST', f'{API}/projects', headers=headers, json={
+            'project_code': code,
+            'project_name': f'Load {code}',
+            'project_start_date': '2025-01-01',
+            'project_end_date': '2025-12-31',
+            'business_unit': 'load',
+            'reviewer_id': self.rng.choice(self.approver_ids),
+            'client_id': 1,
+        })
+        if response is None:
+            return False
+        project_id = response.json()['id']
+        response = await call(self.client, 'list_versions', 'GET', f'{API}/projects/{project_id}/versions')
+        if response is None:
+            return False
+        version_id = response.json()['items'][-1]['id']
+
+        for revision in range(1 + self.args.max_revisions):
+            if not await self.prepare_and_submit(headers, project_id, version_id):
+                return False
+            status = await self.wait_for_decision(project_id, version_id)
+            if status != 'approved' or revision == self.args.max_revisions or self.rng.random() >= self.args.revise:
+                return status is not None
+            response = await call(self.client, 'new_version', 'POST', f'{API}/projects/{project_id}/new-version',
+                                  headers=headers)
+            if response is None:
+                return False
+            version_id = response.json()['id']
+        return True
+
+    async def prepare_and_submit(self, headers: dict, project_id: int, version_id: int) -> bool:
+        call = self.recorder.call
+        categories = [
+            {'name': f'role {i}', 'rate_card_id': self.rng.randint(1, self.args.rate_cards)}
+            for i in range(self.rng.randint(1, 4))
+        ]
+        steps = (
+            ('add_job_categories', 'POST', f'{API}/projects/{project_id}/versions/{version_id}/job-categories',
+             {'json': categories}),
+            ('upload_contract', 'POST', f'{API}/projects/{project_id}/versions/{version_id}/contracts', {
+                'data': {'document_type': 'msa', 'valid_from': '2025-01-01', 'valid_till': '2026-01-01'},
+                'files': {'file': ('contract.pdf', CONTRACT_BYTES, 'application/pdf')},
+            }),
+            ('submit', 'POST', f'{API}/projects/{project_id}/submit', {}),
+        )
+        for step, method, url, kwargs in steps:
+            if await call(self.client, step, method, url, headers=headers, **kwargs) is None:
+                return False
+        return True
+
+    async def wait_for_decision(self, project_id: int, version_id: int) -> str | None:
+        """Polls the versions list until version_id is decided; None on timeout or shutdown."""
+        give_up = time.monotonic() + self.args.decision_timeout
+        while self.running() and time.monotonic() < give_up:
+            await asyncio.sleep(self.args.poll_interval)
+            response = await self.recorder.call(self.client, 'poll_versions', 'GET',
+                                                f'{API}/projects/{project_id}/versions')
+            if response is None:
+                continue
+            for version in response.json()['items']:
+                if version['id'] == version_id and version['status'] in ('approved', 'rejected'):
+                    return version['status']
+        return None
+
+    async def approver(self, user_id: int) -> None:
+        headers = {'X-User-Id': str(user_id), 'X-Role': 'approver'}
+        call = self.recorder.call
+        rng = random.Random(f'{self.args.seed}-{user_id}')
+        while self.running():
+            if self.args.queue == 'claim':
+                response = await call(self.client, 'claim', 'POST', f'{API}/approvals/claim', headers=headers,
+                                      json={'limit': self.args.approver_batch, 'all_reviewers': True})
+                items = response.json() if response is not None else []
+            else:
+                shared = 'true' if self.args.queue == 'shared' else 'false'
+                response = await call(self.client, 'list_pending', 'GET',
+                                      f'{API}/approvals/pending?all_reviewers={shared}&limit={self.args.approver_batch}',
+                                      headers=headers)
+                items = response.json()['items'] if response is not None else []
+                # spread approvers over the queue instead of all racing for its head
+                rng.shuffle(items)
+
+            if not items:
+                await asyncio.sleep(self.args.poll_interval)
+                continue
+            for item in items:
+                if not self.running():
+                    return
+                await asyncio.sleep(rng.expovariate(1 / self.args.review_seconds) if self.args.review_seconds else 0)
+                step = 'reject' if rng.random() < self.args.reject_ratio else 'approve'
+                response = await call(self.client, step, 'POST', f'{API}/approvals/{item["id"]}/{step}',
+                                      headers=headers, json={'comment': 'load test'})
+                if response is not None:
+                    self.recorder.counters['decisions'] += 1
+
+    async def run(self) -> float:
+        self.deadline = time.monotonic() + self.args.duration
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(self.creator(user_id)) for user_id in self.creator_ids]
+        tasks += [asyncio.create_task(self.approver(user_id)) for user_id in self.approver_ids]
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+
+def report(recorder: Recorder, elapsed: float) -> dict:
+    steps = {
+        step: summarize(latencies, recorder.errors[step])
+        for step, latencies in sorted(recorder.latencies.items())
+    }
+    requests = sum(len(latencies) for latencies in recorder.latencies.values())
+    errors = sum(recorder.errors.values())
+    conflicts = sum(recorder.conflicts.values())
+    decision_attempts = sum(len(recorder.latencies[step]) for step in ('approve', 'reject'))
+    decision_conflicts = recorder.conflicts['approve'] + recorder.conflicts['reject']
+    return {
+        'elapsed_seconds': round(elapsed, 2),
+        'requests': requests,
+        'requests_per_second': round(requests / elapsed, 2),
+        'workflows_started': recorder.counters['workflows_started'],
+        'workflows_completed': recorder.counters['workflows_completed'],
+        'workflows_per_second': round(recorder.counters['workflows_completed'] / elapsed, 2),
+        'decisions_per_second': round(recorder.counters['decisions'] / elapsed, 2),
+        'error_rate': round(errors / requests, 4) if requests else 0.0,
+        'conflict_rate': round(conflicts / requests, 4) if requests else 0.0,
+        'decision_conflict_rate': round(decision_conflicts / decision_attempts, 4) if decision_attempts else 0.0,
+        'statuses': dict(sorted(recorder.statuses.items())),
+        'steps': {
+            step: {**asdict(summary), 'conflicts': recorder.conflicts[step]}
+            for step, summary in steps.items()
+        },
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f'{"step":<20}{"n":>7}{"err":>6}{"conflict":>10}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}')
+    for step, s in result['steps'].items():
+        print(f'{step:<20}{s["n"]:>7}{s["errors"]:>6}{s["conflicts"]:>10}'
+              f'{s["p50_ms"]:>9.1f}{s["p95_ms"]:>9.1f}{s["p99_ms"]:>9.1f}')
+    print()
+    for key in ('elapsed_seconds', 'requests', 'requests_per_second', 'workflows_started', 'workflows_completed',
+                'workflows_per_second', 'decisions_per_second', 'error_rate', 'conflict_rate',
+                'decision_conflict_rate', 'statuses'):
+        print(f'{key:<24}{result[key]}')
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_argument_group('target')
+    target.add_argument('--base-url', help='a running server; default is the app in process')
+    target.add_argument('--database-url', help='in process only; defaults to a temporary SQLite file')
+    target.add_argument('--reset', action='store_true', help='required with --database-url: drops every table first')
+    target.add_argument('--scale', type=float, default=0.001, help='generate_data scale for the in-process database')
+    target.add_argument('--users', type=int, default=500,
+                        help='with --base-url: the --users the target was generated with')
+    target.add_argument('--rate-cards', type=int, default=50)
+
+    mix = parser.add_argument_group('workload')
+    mix.add_argument('--creators', type=int, default=20)
+    mix.add_argument('--approvers', type=int, default=4)
+    mix.add_argument('--rate', type=float, default=5.0, help='workflow starts per second across all creators')
+    mix.add_argument('--duration', type=float, default=30.0, help='seconds')
+    mix.add_argument('--queue', choices=('own', 'shared', 'claim'), default='shared',
+                     help="approvers read their own inbox, race over the whole queue, or lease via /approvals/claim")
+    mix.add_argument('--approver-batch', type=int, default=10)
+    mix.add_argument('--review-seconds', type=float, default=0.05, help='mean think time per decision')
+    mix.add_argument('--reject-ratio', type=float, default=0.2)
+    mix.add_argument('--revise', type=float, default=0.3, help='chance an approved project gets a new version')
+    mix.add_argument('--max-revisions', type=int, default=2)
+    mix.add_argument('--decision-timeout', type=float, default=20.0)
+    mix.add_argument('--poll-interval', type=float, default=0.5)
+    mix.add_argument('--seed', type=int, default=0)
+    mix.add_argument('--json', type=Path, metavar='PATH', help='also write the report here')
+    args = parser.parse_args(argv)
+
+    if args.database_url and not args.reset:
+        parser.error('--database-url wipes that database; pass --reset to confirm')
+    if args.base_url and args.database_url:
+        parser.error('--database-url only applies in process')
+    return args
+
+
+async def _run(args, client: httpx.AsyncClient, users: int) -> dict:
+    from bench.generate_data import Volumes
+
+    volumes = Volumes(clients=1, versions=1, audit_rows=0, users=users)
+    creator_ids = list(volumes.creators)[:args.creators]
+    approver_ids = list(volumes.approvers)[:args.approvers]
+    if len(creator_ids) < args.creators or len(approver_ids) < args.approvers:
+        raise SystemExit(f'{users} users give at most {len(volumes.creators)} creators / '
+                         f'{len(volumes.approvers)} approvers')
+
+    workload = Workload(client, args, creator_ids, approver_ids)
+    elapsed = await workload.run()
+    return report(workload.recorder, elapsed)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    json_path = args.json.resolve() if args.json else None
+    timeout = httpx.Timeout(60.0)
+
+    if args.base_url:
+        async def remote():
+            async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout) as client:
+                return await _run(args, client, args.users)
+        result = asyncio.run(remote())
+    else:
+        scratch_environment(args.database_url)
+        from app.db.session import get_async_engine, get_engine
+        from app.main import app
+        from bench.generate_data import Volumes, generate, prepare_schema
+
+        # enough users for the requested mix: 80% creators, 20% approvers
+        users = max(50, 5 * args.approvers, -(-args.creators * 5 // 4))
+        engine = get_engine()
+        prepare_schema(engine, reset=True)
+        generate(engine, Volumes.scaled(args.scale, users=users, rate_cards=args.rate_cards), seed=args.seed)
+
+        async def local():
+            # unhandled exceptions become 500s and count as errors, as they would over HTTP
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url='http://loadgen', timeout=timeout) as client:
+                try:
+                    return await _run(args, client, users)
+                finally:
+                    # pooled aiosqlite connections hold non-daemon threads open
+                    await get_async_engine().dispose()
+        result = asyncio.run(local())
+
+    print_report(result)
+    if json_path:
+        json_path.write_text(json.dumps(result, indent=2) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
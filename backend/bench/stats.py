@@ -0,0 +1,84 @@
+import json
+import statistics
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+@dataclass
+class Summary:
+    n: int
+    errors: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries: float
+
+
+def summarize(latencies: list[float], errors: int = 0, queries: list[int] | None = None) -> Summary:
+    """latencies in seconds; queries is the per-request statement count, if measured."""
+    ms = sorted(value * 1000 for value in latencies)
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ms[0] if ms else 0.0
+    return Summary(
+        n=len(ms),
+        errors=errors,
+        mean_ms=round(statistics.fmean(ms), 3) if ms else 0.0,
+        p50_ms=round(p50, 3),
+        p95_ms=round(p95, 3),
+        p99_ms=round(p99, 3),
+        queries=round(statistics.fmean(queries), 2) if queries else 0.0,
+    )
+
+
+def save_report(path: Path, meta: dict, results: dict[str, Summary]) -> None:
+    payload = {'meta': meta, 'routes': {name: asdict(summary) for name, summary in results.items()}}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + '\n')
+
+
+def compare(
+    results: dict[str, Summary],
+    baseline_path: Path,
+    metric: str,
+    tolerance: float,
+    min_delta_ms: float,
+) -> list[str]:
+    """
+    Regressions against a saved report: `metric` (p50_ms, p95_ms, ...) slower by
+    more than `tolerance` and by at least min_delta_ms, so sub-millisecond noise
+    is ignored; more queries per request; or new errors.
+    """
+    baseline = json.loads(baseline_path.read_text())['routes']
+    regressions = []
+    for name, summary in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        now, then = getattr(summary, metric), before[metric]
+        if now > then * (1 + tolerance) and now - then >= min_delta_ms:
+            regressions.append(f'{name}: {metric} {now:.2f} vs baseline {then:.2f}')
+        if summary.queries > before['queries']:
+            regressions.append(f'{name}: {summary.queries} queries/request vs baseline {before["queries"]}')
+        if summary.errors > before['errors']:
+            regressions.append(f'{name}: {summary.errors} errors vs baseline {before["errors"]}')
+    return regressions
+
+
+def format_table(
+    results: dict[str, Summary],
+    baseline_path: Path | None = None,
+    metric: str = 'p50_ms',
+) -> str:
+    baseline = json.loads(baseline_path.read_text())['routes'] if baseline_path else {}
+    vs = f'vs {metric[:3]}'
+    lines = [f'{"route":<18}{"n":>6}{"err":>5}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"queries":>9}{vs:>9}']
+    for name, s in results.items():
+        before = baseline.get(name)
+        delta = f'{(getattr(s, metric) / before[metric] - 1) * 100:+.0f}%' if before and before[metric] else ''
+        lines.append(
+            f'{name:<18}{s.n:>6}{s.errors:>5}{s.p50_ms:>9.2f}{s.p95_ms:>9.2f}{s.p99_ms:>9.2f}{s.queries:>9.2f}{delta:>9}'
+        )
+    return '\n'.join(lines)
@@ -1,3 +1,6 @@
+-- trigram search indexes (gin_trgm_ops)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE users (
     id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     name TEXT NOT NULL,
@@ -16,7 +19,8 @@ CREATE TABLE clients (
     primary_contact_name TEXT NOT NULL,
     primary_contact_designation TEXT NULL,
     primary_contact_phone TEXT NOT NULL,
-    primary_contact_email TEXT NOT NULL
+    primary_contact_email TEXT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
 );
 
 CREATE TABLE projects (
@@ -25,7 +29,8 @@ CREATE TABLE projects (
     client_id INTEGER NOT NULL REFERENCES clients(id),
     created_by INTEGER NOT NULL REFERENCES users(id),
     name TEXT NOT NULL,
-    active_version_id INTEGER NULL
+    active_version_id INTEGER NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
 );
 
 CREATE TABLE project_versions (
@@ -43,7 +48,10 @@ CREATE TABLE project_versions (
     approved_at TIMESTAMP NULL,
     rejected_at TIMESTAMP NULL,
     rejection_comment TEXT NULL,
-    is_active BOOLEAN DEFAULT FALSE
+    is_active BOOLEAN DEFAULT FALSE,
+    claimed_by INTEGER NULL REFERENCES users(id),
+    claim_expires_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
 );
 
 ALTER TABLE projects
@@ -58,6 +66,8 @@ CREATE TABLE contract_documents (
     valid_till DATE NOT NULL,
     s3_key TEXT NOT NULL,
     filename TEXT NOT NULL,
+    size_bytes INTEGER NULL,
+    checksum_sha256 TEXT NULL,
     uploaded_at TIMESTAMP NOT NULL
 );
 
@@ -84,15 +94,49 @@ CREATE TABLE approval_events (
     created_at TIMESTAMP NOT NULL
 );
 
+-- Range-partitioned by month: time-bounded queries only touch the partitions they
+-- cover and retention drops whole partitions. python -m scripts.audit_partitions
+-- creates months ahead and archives + drops expired ones. The default partition
+-- only catches rows outside every month and should stay empty.
 CREATE TABLE audit_logs (
-    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY,
     entity_type TEXT NOT NULL,
     entity_id TEXT NOT NULL,
     action TEXT NOT NULL,
     actor_id INTEGER NOT NULL,
     data JSONB NULL,
-    created_at TIMESTAMP NOT NULL
-);
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+-- Keep in sync with __table_args__ on the models: python -m scripts.check_schema
+CREATE INDEX clients_legal_entity_name_trgm_idx ON clients USING gin (legal_entity_name gin_trgm_ops);
+CREATE INDEX clients_gst_number_trgm_idx ON clients USING gin (gst_number gin_trgm_ops);
+CREATE INDEX clients_primary_contact_email_trgm_idx ON clients USING gin (primary_contact_email gin_trgm_ops);
+
+CREATE INDEX projects_client_id_idx ON projects(client_id);
+CREATE INDEX projects_created_by_idx ON projects(created_by);
+CREATE INDEX projects_active_version_id_idx ON projects(active_version_id);
+CREATE INDEX projects_project_code_trgm_idx ON projects USING gin (project_code gin_trgm_ops);
+CREATE INDEX projects_name_trgm_idx ON projects USING gin (name gin_trgm_ops);
+
+CREATE INDEX project_versions_project_status_version_idx ON project_versions(project_id, status, version_number);
+CREATE INDEX project_versions_pending_reviewer_idx ON project_versions(reviewer_id, submitted_at, id) WHERE status = 'pending';
+CREATE INDEX project_versions_pending_idx ON project_versions(submitted_at, id) WHERE status = 'pending';
+CREATE INDEX project_versions_reviewer_id_idx ON project_versions(reviewer_id);
+CREATE INDEX project_versions_creator_id_idx ON project_versions(creator_id);
+CREATE INDEX project_versions_claimed_by_idx ON project_versions(claimed_by);
+
+CREATE INDEX contract_documents_project_version_id_idx ON contract_documents(project_version_id);
+
+CREATE INDEX job_categories_project_version_id_idx ON job_categories(project_version_id);
+CREATE INDEX job_categories_rate_card_id_idx ON job_categories(rate_card_id);
+
+CREATE INDEX approval_events_project_version_id_idx ON approval_events(project_version_id);
+CREATE INDEX approval_events_actor_id_idx ON approval_events(actor_id);
 
-CREATE INDEX users_id_idx ON users(id);
-CREATE INDEX clients_id_idx ON clients(id);
+CREATE INDEX audit_logs_entity_created_at_idx ON audit_logs(entity_type, entity_id, created_at);
+CREATE INDEX audit_logs_created_at_brin_idx ON audit_logs USING brin (created_at);
+CREATE INDEX audit_logs_actor_created_at_idx ON audit_logs(actor_id, created_at);
@@ -0,0 +1,208 @@
+"""
+Monthly partition maintenance for audit_logs (partitioned in schema.sql).
+
+Creates the partitions for this month and the next AUDIT_PARTITION_MONTHS_AHEAD
+months (and past months from --since, to backfill); rows that already fell into
+the default partition for such a month are moved into it. Partitions entirely
+older than AUDIT_RETENTION_MONTHS are detached, streamed to storage as gzip
+NDJSON under AUDIT_ARCHIVE_PREFIX/audit_logs_yYYYYmMM.ndjson.gz and dropped once
+the archive holds every row. A partition detached by an interrupted run is picked up again
+by the next one, so it is safe to run daily from cron. Postgres only.
+
+    python -m scripts.audit_partitions [--dry-run] [--ahead 3] [--retention-months 24] [--since 2024-01-01]
+"""
+import argparse
+import json
+import re
+import sys
+import zlib
+from datetime import date
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.db.session import get_engine
+from app.models.audit import AuditLog
+from app.services.storage import StoredObject, storage
+
+PARENT = 'audit_logs'
+DEFAULT_PARTITION = 'audit_logs_default'
+_NAME_RE = re.compile(r'^audit_logs_y(\d{4})m(\d{2})$')
+_COLUMNS = [column.name for column in AuditLog.__table__.columns]
+_FETCH_ROWS = 5000
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f'{PARENT}_y{month.year:04d}m{month.month:02d}'
+
+
+def plan(
+    today: date,
+    existing: set[date],
+    ahead: int,
+    retention_months: int,
+    since: date | None = None,
+) -> tuple[list[date], list[date]]:
+    """
+    (months to create, months to expire). Creates from `since` (default: this
+    month) through `ahead` months out, skipping months already past retention;
+    a month expires once it ends before the retention window.
+    """
+    current = today.replace(day=1)
+    keep_from = add_months(current, -retention_months) if retention_months > 0 else date.min
+    month = max((since or current).replace(day=1), keep_from)
+    create = []
+    while month <= add_months(current, ahead):
+        if month not in existing:
+            create.append(month)
+        month = add_months(month, 1)
+    return create, sorted(m for m in existing if add_months(m, 1) <= keep_from)
+
+
+class _GzipNDJSON:
+    """Read-only file object yielding rows as gzip-compressed NDJSON, for storage.save_stream."""
+
+    def __init__(self, rows: Iterator[dict]):
+        self.rows = rows
+        self.count = 0
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+        self._buffer = bytearray()
+        self._done = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            lines = []
+            for row in self.rows:
+                lines.append(json.dumps(row, separators=(',', ':')))
+                if len(lines) == _FETCH_ROWS:
+                    break
+            if lines:
+                self.count += len(lines)
+                self._buffer += self._compressor.compress(('\n'.join(lines) + '\n').encode())
+            else:
+                self._buffer += self._compressor.flush()
+                self._done = True
+        if size < 0:
+            size = len(self._buffer)
+        chunk = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return chunk
+
+
+def _partitions(conn: Connection) -> dict[date, bool]:
+    """Monthly tables by month -> whether still attached to audit_logs."""
+    rows = conn.execute(text(
+        "SELECT relname, relispartition FROM pg_class "
+        "WHERE relkind = 'r' AND relname ~ '^audit_logs_y[0-9]{4}m[0-9]{2}$' "
+        "AND relnamespace = current_schema()::regnamespace"
+    ))
+    partitions = {}
+    for name, attached in rows:
+        year, month = _NAME_RE.match(name).groups()
+        partitions[date(int(year), int(month), 1)] = attached
+    return partitions
+
+
+def _check_partitioned(conn: Connection) -> None:
+    kind = conn.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {'name': PARENT}).scalar()
+    if kind != 'p':
+        raise SystemExit(f'{PARENT} is not a partitioned table; create it from schema.sql')
+
+
+def create_partition(conn: Connection, month: date) -> int:
+    """Creates and attaches one month; returns how many rows were moved out of the default partition."""
+    name, lower, upper = partition_name(month), month, add_months(month, 1)
+    bounds = {'lower': lower, 'upper': upper}
+    with conn.begin():
+        has_default = conn.execute(text('SELECT to_regclass(:name) IS NOT NULL'), {'name': DEFAULT_PARTITION}).scalar()
+        stray = has_default and conn.execute(text(
+            f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper)'
+        ), bounds).scalar()
+        if not stray:
+            conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            ))
+            return 0
+        # attaching over rows still in the default partition fails, so move them first
+        conn.execute(text(f'CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+        moved = conn.execute(text(
+            f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper '
+            f'RETURNING {", ".join(_COLUMNS)}) INSERT INTO {name} ({", ".join(_COLUMNS)}) SELECT * FROM moved'
+        ), bounds).rowcount
+        conn.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"))
+        return moved
+
+
+def archive_partition(conn: Connection, month: date, attached: bool) -> StoredObject:
+    """Detaches (if needed), archives and drops one month."""
+    name = partition_name(month)
+    if attached:
+        with conn.begin():
+            conn.execute(text(f'ALTER TABLE {PARENT} DETACH PARTITION {name}'))
+
+    with conn.begin():
+        expected = conn.execute(text(f'SELECT count(*) FROM {name}')).scalar()
+        result = conn.execute(
+            text(f'SELECT {", ".join(_COLUMNS)} FROM {name} ORDER BY created_at, id')
+            .execution_options(stream_results=True, yield_per=_FETCH_ROWS)
+        )
+        rows = (
+            {**row._asdict(), 'created_at': row.created_at.isoformat()}
+            for row in result
+        )
+        body = _GzipNDJSON(rows)
+        stored = storage.save_stream(f'{settings.AUDIT_ARCHIVE_PREFIX}/{name}.ndjson.gz', body)
+        if body.count != expected:
+            raise SystemExit(f'{name}: archived {body.count} of {expected} rows; partition kept (detached)')
+        conn.execute(text(f'DROP TABLE {name}'))
+    return stored
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ahead', type=int, default=settings.AUDIT_PARTITION_MONTHS_AHEAD,
+                        help='months to create after the current one')
+    parser.add_argument('--retention-months', type=int, default=settings.AUDIT_RETENTION_MONTHS,
+                        help='months kept in the database; 0 archives nothing')
+    parser.add_argument('--since', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                        help='also create past months from here, moving their rows out of the default partition')
+    parser.add_argument('--today', type=date.fromisoformat, default=date.today(), help=argparse.SUPPRESS)
+    parser.add_argument('--dry-run', action='store_true', help='print what would change')
+    args = parser.parse_args(argv)
+
+    engine = get_engine()
+    if engine.dialect.name != 'postgresql':
+        print(f'{PARENT} is only partitioned on Postgres; nothing to do on {engine.dialect.name}', file=sys.stderr)
+        return 1
+
+    with engine.connect() as conn:
+        with conn.begin():
+            _check_partitioned(conn)
+            partitions = _partitions(conn)
+        create, expire = plan(args.today, set(partitions), args.ahead, args.retention_months, args.since)
+
+        for month in create:
+            if args.dry_run:
+                print(f'would create {partition_name(month)}')
+                continue
+            moved = create_partition(conn, month)
+            print(f'created {partition_name(month)}' + (f' ({moved} rows moved from {DEFAULT_PARTITION})' if moved else ''))
+
+        for month in expire:
+            if args.dry_run:
+                print(f'would archive and drop {partition_name(month)}')
+                continue
+            stored = archive_partition(conn, month, partitions[month])
+            print(f'archived {partition_name(month)} to {stored.location} ({stored.size} bytes, sha256 {stored.sha256})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
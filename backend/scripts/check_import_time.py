@@ -0,0 +1,108 @@
+"""
+Cold-start import budget for the Lambda entry point.
+
+Imports the third-party stack (FRAMEWORK) first and then app.lambda_handler
+under `python -X importtime`, in fresh interpreters. The budget applies to the
+best cumulative time of app.lambda_handler itself, i.e. what this code adds on
+top of the framework; the framework floor and the total are printed for
+reference. Also fails when a module that must stay lazy (DB drivers, boto3) is
+imported eagerly.
+
+    python -m scripts.check_import_time [--budget-ms 600] [--runs 5]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+TARGET = 'app.lambda_handler'
+
+# Imported before TARGET so its timing excludes them. Their cost depends on the
+# installed versions and the machine far more than on this code.
+FRAMEWORK = (
+    'fastapi', 'fastapi.security', 'sqlalchemy.orm', 'sqlalchemy.ext.asyncio',
+    'pydantic_settings', 'email_validator', 'mangum', 'multipart',
+)
+
+# Best of 5 for TARGET alone was ~410-420 ms (framework floor ~900-1000 ms more)
+# on a single-vCPU Xeon container with Python 3.11 and requirements.txt pins.
+# Slower machines need IMPORT_TIME_BUDGET_MS raised to match.
+DEFAULT_BUDGET_MS = 600
+
+# created on first use in app.db.session / app.services.storage
+LAZY_MODULES = ('boto3', 'botocore', 'psycopg2', 'asyncpg', 'aiosqlite')
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def measure() -> tuple[int, int, set[str]]:
+    """Returns (cumulative microseconds for TARGET, for everything, top-level modules imported)."""
+    env = dict(os.environ, STORAGE_MODE='local')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {", ".join(FRAMEWORK)}; import {TARGET}'],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f'importing {TARGET} failed:\n{result.stderr}')
+
+    cumulative_us = None
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        modules.add(name.split('.')[0])
+        if len(match.group(3)) == 1:  # top level: nested imports are indented further
+            total_us += int(match.group(2))
+        if name == TARGET:
+            cumulative_us = int(match.group(2))
+
+    if cumulative_us is None:
+        raise SystemExit(f'{TARGET} was not in the -X importtime output (already cached?)')
+    return cumulative_us, total_us, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--budget-ms',
+        type=float,
+        default=float(os.environ.get('IMPORT_TIME_BUDGET_MS', DEFAULT_BUDGET_MS)),
+        help=f'for {TARGET} on top of the framework',
+    )
+    parser.add_argument('--runs', type=int, default=5, help='best of N fresh interpreters')
+    args = parser.parse_args()
+
+    timings, totals, eager = [], [], set()
+    for _ in range(args.runs):
+        cumulative_us, total_us, modules = measure()
+        timings.append(cumulative_us / 1000)
+        totals.append(total_us / 1000)
+        eager |= modules.intersection(LAZY_MODULES)
+
+    best, total = min(timings), min(totals)
+    print(
+        f'{TARGET}: best {best:.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms); '
+        f'framework floor {total - best:.0f} ms, total {total:.0f} ms'
+    )
+
+    failed = False
+    if eager:
+        print(f'imported eagerly but should be lazy: {sorted(eager)}', file=sys.stderr)
+        failed = True
+    if best > args.budget_ms:
+        print(f'import time over budget by {best - args.budget_ms:.0f} ms', file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Query budgets for read routes. Seeds a throwaway SQLite database, calls each
+route in process and fails when it issues more SQL statements than allowed or
+repeats one SELECT three times, so lazy-loading regressions (N+1) are caught
+before they reach production.
+
+    python -m scripts.check_query_counts
+"""
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+_DB_PATH = Path(tempfile.mkdtemp()) / 'query_counts.db'
+# must be set before app.core.config is imported
+os.environ['DATABASE_URL'] = f'sqlite:///{_DB_PATH}'
+os.environ.pop('ASYNC_DATABASE_URL', None)
+# a SELECT repeated this often within one request fails the route outright
+os.environ['SQL_RAISE_ON_N_PLUS_ONE'] = 'true'
+os.environ['SQL_N_PLUS_ONE_THRESHOLD'] = '3'
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+import app.models as models  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.instrumentation import NPlusOneError  # noqa: E402
+from app.db.session import SessionLocal, get_async_engine, get_engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+APPROVER = {'X-User-Id': '2', 'X-Role': 'approver'}
+
+# route -> maximum statements per request
+BUDGETS = {
+    '/api/v1/projects/1': 1,
+    '/api/v1/projects/1/versions': 2,  # ETag aggregate + page
+    '/api/v1/projects/1/full': 4,
+    '/api/v1/approvals/pending?all_reviewers=true': 1,
+    '/api/v1/audit?actor_id=1&since=2024-01-01T00:00:00': 1,
+}
+
+
+def seed() -> None:
+    with SessionLocal() as db:
+        db.add_all([
+            models.User(id=1, name='creator', role='creator'),
+            models.User(id=2, name='approver', role='approver'),
+        ])
+        db.add(models.Client(
+            id=1,
+            legal_entity_name='Acme',
+            registered_address='1 Road',
+            mode_of_payment='wire',
+            gst_number='GST1',
+            billing_currency='INR',
+            primary_contact_name='Pat',
+            primary_contact_phone='1',
+            primary_contact_email='pat@example.com',
+        ))
+        db.add_all([models.RateCard(id=i, name=f'rc{i}', rate_per_hour='10', currency='USD') for i in (1, 2, 3)])
+        db.add(models.Project(id=1, project_code='P1', client_id=1, created_by=1, name='Project'))
+        db.flush()
+
+        for number, status in ((1, 'approved'), (2, 'pending'), (3, 'draft')):
+            db.add(models.ProjectVersion(
+                id=number,
+                project_id=1,
+                version_number=number,
+                status=status,
+                project_name='Project',
+                project_start_date=date(2024, 1, 1),
+                project_end_date=date(2024, 12, 31),
+                business_unit='bu',
+                reviewer_id=2,
+                creator_id=1,
+                submitted_at=datetime(2024, 1, number),
+                is_active=number == 1,
+            ))
+            for i in range(5):
+                db.add(models.ContractDocument(
+                    project_version_id=number,
+                    document_type='msa',
+                    valid_from=date(2024, 1, 1),
+                    valid_till=date(2025, 1, 1),
+                    s3_key=f'1/{number}/{i}.pdf',
+                    filename=f'{i}.pdf',
+                    uploaded_at=datetime(2024, 1, 1),
+                ))
+                db.add(models.JobCategory(project_version_id=number, name=f'jc{i}', rate_card_id=i % 3 + 1))
+        db.flush()
+        db.get(models.Project, 1).active_version_id = 1
+        db.commit()
+
+
+def main() -> int:
+    Base.metadata.create_all(get_engine())
+    seed()
+
+    counter = {'statements': 0}
+
+    def count(*_args):
+        counter['statements'] += 1
+
+    for engine in (get_engine(), get_async_engine().sync_engine):
+        event.listen(engine, 'before_cursor_execute', count)
+
+    failed = False
+    with TestClient(app) as client:
+        for route, budget in BUDGETS.items():
+            counter['statements'] = 0
+            try:
+                response = client.get(route, headers=APPROVER)
+            except NPlusOneError as exc:
+                failed = True
+                print(f'FAIL {route}: {exc}')
+                continue
+            used = counter['statements']
+            ok = response.status_code == 200 and used <= budget
+            failed |= not ok
+            print(f'{"ok  " if ok else "FAIL"} {route}: {used} queries (budget {budget}), HTTP {response.status_code}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Fails when the SQLAlchemy models and schema.sql disagree on tables, columns or
+indexes.
+
+    python -m scripts.check_schema
+"""
+import re
+import sys
+from pathlib import Path
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.db.base import Base
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / 'schema.sql'
+
+_TABLE_RE = re.compile(
+    r'CREATE TABLE (?:IF NOT EXISTS )?(\w+)\s*\((.*?)\)\s*(?:PARTITION BY [^;]*)?;',
+    re.IGNORECASE | re.DOTALL,
+)
+_INDEX_RE = re.compile(
+    r'CREATE (UNIQUE )?INDEX (?:IF NOT EXISTS )?(\w+)\s+ON\s+(\w+)'
+    r'(?:\s+USING\s+(\w+))?\s*\(([^)]*)\)(?:\s+WHERE\s+([^;]*))?;',
+    re.IGNORECASE | re.DOTALL,
+)
+_CONSTRAINT_KEYWORDS = {'primary', 'constraint', 'unique', 'foreign', 'check', 'exclude'}
+
+
+def _normalize(sql: str | None) -> str | None:
+    if sql is None:
+        return None
+    return ' '.join(sql.replace('(', ' ').replace(')', ' ').split()).lower()
+
+
+def _split_top_level(body: str) -> list[str]:
+    parts, depth, current = [], 0, []
+    for char in body:
+        if char == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        current.append(char)
+    parts.append(''.join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_schema(sql: str) -> tuple[dict, dict]:
+    sql = re.sub(r'--[^\n]*', '', sql)
+    tables = {}
+    for name, body in _TABLE_RE.findall(sql):
+        columns = set()
+        for item in _split_top_level(body):
+            first_word = item.split()[0].lower()
+            if first_word in _CONSTRAINT_KEYWORDS:
+                continue
+            columns.add(first_word)
+        tables[name.lower()] = columns
+
+    indexes = {}
+    for unique, name, table, using, columns, where in _INDEX_RE.findall(sql):
+        cols, ops = [], {}
+        for col in columns.split(','):
+            tokens = col.split()
+            cols.append(tokens[0].lower())
+            if len(tokens) > 1:
+                ops[tokens[0].lower()] = tokens[1].lower()
+        indexes[name.lower()] = {
+            'table': table.lower(),
+            'columns': cols,
+            'unique': bool(unique),
+            'using': (using or 'btree').lower(),
+            'ops': ops,
+            'where': _normalize(where or None),
+        }
+    return tables, indexes
+
+
+def model_schema() -> tuple[dict, dict]:
+    tables, indexes = {}, {}
+    for table in Base.metadata.tables.values():
+        tables[table.name] = {column.name for column in table.columns}
+        for index in table.indexes:
+            options = index.dialect_options['postgresql']
+            where = options['where']
+            indexes[index.name] = {
+                'table': table.name,
+                'columns': [column.name for column in index.columns],
+                'unique': bool(index.unique),
+                'using': (options['using'] or 'btree').lower(),
+                'ops': {k: v.lower() for k, v in (options['ops'] or {}).items()},
+                'where': _normalize(str(where) if where is not None else None),
+            }
+    return tables, indexes
+
+
+def compare(sql: str) -> list[str]:
+    sql_tables, sql_indexes = parse_schema(sql)
+    orm_tables, orm_indexes = model_schema()
+    problems = []
+
+    for name in sorted(orm_tables.keys() | sql_tables.keys()):
+        if name not in sql_tables:
+            problems.append(f'table {name} is mapped but missing from schema.sql')
+        elif name not in orm_tables:
+            problems.append(f'table {name} is in schema.sql but has no model')
+        elif orm_tables[name] != sql_tables[name]:
+            only_orm = sorted(orm_tables[name] - sql_tables[name])
+            only_sql = sorted(sql_tables[name] - orm_tables[name])
+            problems.append(f'table {name} columns differ: model-only={only_orm} sql-only={only_sql}')
+
+    for name in sorted(orm_indexes.keys() | sql_indexes.keys()):
+        if name not in sql_indexes:
+            problems.append(f'index {name} is declared on a model but missing from schema.sql')
+        elif name not in orm_indexes:
+            problems.append(f'index {name} is in schema.sql but not declared on a model')
+        elif orm_indexes[name] != sql_indexes[name]:
+            problems.append(f'index {name} differs: model={orm_indexes[name]} sql={sql_indexes[name]}')
+
+    return problems
+
+
+def main() -> int:
+    problems = compare(SCHEMA_PATH.read_text())
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if problems:
+        return 1
+    print('models and schema.sql agree')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())